@@ -23,6 +23,10 @@ class API:
     # a rogue plugin can call this api to trigger an unintentional shutdown.
     # It's fine for now since this tool is for in-house development only but we need to change it when we go public
     def shutdown(self):
+        # Signal handlers and the normal exit path can both get here; run the feature shutdowns only once
+        if self._shutdown_handled:
+            return
+        self._shutdown_handled = True
         print("API Shutdown!")
         self.feature_manager.shutdown()
 
@@ -1,4 +1,4 @@
-import jinja2
+import html
 from app.core.contracts.easy_options_interface import BaseEasyOptions
 
 class EasyOptions(BaseEasyOptions):
@@ -26,18 +26,15 @@ class EasyOptions(BaseEasyOptions):
         if not self.options:
             return "<p>No options available.</p>"
 
-        template = jinja2.Template("""
-            {% if message %}
-            <h2>{{ message }}</h2>
-            {% endif %}
-            {% for opt in options %}
-            <button onclick="runFeature('{{ feature_name }}', '{{ opt.id }}')">
-                {{ opt.label }}
-            </button>
-            {% endfor %}
-        """)
-
-        return template.render(message=self.message, feature_name=self.feature_name, options=self.options.values())
+        # The markup is a fixed wrapper around a few strings, so build it directly instead of compiling a template per render
+        heading = f"<h2>{html.escape(self.message)}</h2>\n" if self.message else ""
+        # Newline-separated like the old template output: the whitespace is what spaces the inline buttons apart
+        buttons = "\n".join(
+            f"<button onclick=\"runFeature('{html.escape(self.feature_name)}', '{html.escape(opt['id'])}')\">"
+            f"{html.escape(opt['label'])}</button>"
+            for opt in self.options.values()
+        )
+        return heading + buttons
 
 
     def get_option_callable(self, option_id: str) -> callable:
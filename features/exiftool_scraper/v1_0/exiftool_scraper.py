@@ -6,6 +6,20 @@ from jinja2 import Template
 from app.core.easy_options import EasyOptions
 from app.core.contracts.feature_interface import BaseFeature
 
+# Compiled once at import instead of on every run; autoescape because tag values come straight from the file
+_HTML_TEMPLATE = Template("""
+        <h2>EXIFTool Metadata</h2>
+        <p><strong>File:</strong> {{ file }}</p>
+        <table>
+            <thead><tr><th>Tag</th><th>Value</th></tr></thead>
+            <tbody>
+            {% for key, value in metadata.items() %}
+                <tr><td>{{ key }}</td><td>{{ value }}</td></tr>
+            {% endfor %}
+            </tbody>
+        </table>
+        """, autoescape=True)
+
 def register():
     instance = Feature()
 
@@ -47,19 +61,5 @@ class Feature(BaseFeature):
         except Exception as e:
             return f"<p>Error running exiftool: {e}</p>"
 
-        # Render HTML using Jinja2
-        template_str = """
-        <h2>EXIFTool Metadata</h2>
-        <p><strong>File:</strong> {{ file }}</p>
-        <table>
-            <thead><tr><th>Tag</th><th>Value</th></tr></thead>
-            <tbody>
-            {% for key, value in metadata.items() %}
-                <tr><td>{{ key }}</td><td>{{ value }}</td></tr>
-            {% endfor %}
-            </tbody>
-        </table>
-        """
-
-        template = Template(template_str)
-        return template.render(file=os.path.basename(file_path), metadata=metadata)
+        # Render HTML using the template compiled at import
+        return _HTML_TEMPLATE.render(file=os.path.basename(file_path), metadata=metadata)
@@ -6,8 +6,8 @@
 #
 # Architecture & Modularity:
 # - Feature(BaseFeature): Implements the feature contract for FeatureManager. Provides EasyOptions callbacks and default behavior.
-# - SteghideResult (dataclass): Internal normalized container for results (action, success, parsed info, extracted paths, raw stdout/stderr, etc.). Exposed as dict via to_dict().
-# - Templating: Uses jinja2.Template for HTML rendering of Info/Extract results and Help panel.
+# - SteghideResult (dataclass): Internal normalized container for results (action, success, parsed info, extracted paths, raw stdout/stderr, etc.). Immutable (slots, frozen); exposed as dict via dataclasses.asdict().
+# - Templating: Uses a jinja2 Environment (DictLoader, compiled once at import) for HTML rendering of Info/Extract results and Help panel.
 #
 # Contracts used:
 # - app.core.contracts.feature_interface.BaseFeature
@@ -21,12 +21,16 @@
 # - Binary: steghide (native binary on Linux/macOS or steghide.exe on Windows).
 # - Windows fallback: Uses WSL (wsl -e steghide) if no native binary is found.
 # - Path conversion: Windows paths (C:\…) mapped to /mnt/c/… for WSL.
+# - WSL2: /mnt/c behaves like a network share, so cover files over 8 MB are copied to /tmp inside WSL first.
+#   Single Info/Extract only; run_batch's WSL loop reads every file in place.
 # - Non-interactive: Always passes -p <passphrase> to prevent interactive prompts.
+# - STEGHIDE_PERSISTENT_WSL=1: reuse one long-lived `wsl -e bash` for all WSL calls (closed in shutdown()).
 #
 # Commands Executed:
 # - Info: steghide info -v -sf <file> -p <passphrase> (parses Key: Value lines from stdout)
 # - Extract: steghide extract -sf <file> -xf <output_file> -f -p <passphrase> (writes steghide_extracted.bin next to input)
-# - Passphrase: Collected via tkinter prompt (masked); falls back to empty passphrase if unavailable.
+# - Passphrase: params["passphrase"] when given (an empty string counts), otherwise collected via tkinter prompt (masked);
+#   falls back to empty passphrase if unavailable.
 #
 # EasyOptions (UI):
 # Option ID         Label                 Action
@@ -35,7 +39,10 @@
 # extract_html      Extract (HTML)        Runs extract, renders HTML
 # info_json         Info (JSON)           Returns normalized dict as JSON
 # extract_json      Extract (JSON)        Returns normalized dict as JSON
+# - JSON uses orjson (indented) when installed, otherwise compact stdlib json.
 # - run_default() calls Info (HTML) for simple click behavior.
+# - Feature.run_batch(params) runs Info over params["file_paths"] for programmatic callers; it is not a menu option
+#   because the UI only ever passes the one selected file.
 #
 # Normalized Result Schema:
 # {
@@ -50,7 +57,7 @@
 #     "embedded file name": "secret.txt",
 #     "embedded file size": "123 bytes"
 #   },
-#   "extracted": ["C:/path/to/steghide_extracted.bin"],  # only for extract
+#   "extracted": ["C:/path/to/steghide_extracted.bin"],  # only for extract (info then holds "extracted_size")
 #   "errors": null,                # stderr or message on failure
 #   "raw": {
 #     "stdout": "...",
@@ -68,12 +75,16 @@
 # - Missing binary: Returns ok=false with a clear note (suggests using WSL or installing steghide).
 # - Unsupported BMP V5 (biSize: 124): Adds a hint to convert to BMP3 (ImageMagick).
 # - Wrong/empty passphrase or no payload: Adds a hint based on common steghide messages.
-# - Timeouts: Clear timeouts for both actions.
+# - Timeouts: Info 10s, extract max(15s, 2s per MB of cover file), +10s for WSL start-up; a timed-out child is terminated, then killed.
 # - Raw output: Full stdout/stderr provided under a collapsible block for debugging.
 #
 # Self-test & Shutdown:
 # - self_test(): Non-blocking (always returns True) so the feature can load even when steghide/WSL isn’t present; users can still read Help.
-# - shutdown(): Logs a simple message; no persistent state to clean up.
+# - shutdown(): Closes the persistent WSL shell if one was started, clears the cached runtime detection and Info cache; logs a message.
+#
+# Caching:
+# - Successful Info results are cached per (absolute path, mtime, size, passphrase), up to 64 entries (LRU), so
+#   repeated clicks on an unchanged file skip steghide. Extract is never cached since it writes to disk.
 #
 # Security Notes:
 # - Passphrase is passed via -p (visible in process args on the local machine). Acceptable for CTF tooling; for stricter handling, use a temp file or env var.
@@ -91,18 +102,27 @@
 
 from __future__ import annotations
 
+import functools
+import html
 import json
 import os
 import platform
+import queue
 import re
 import shutil
+import shlex
+import stat
 import subprocess
 import tempfile
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
 
 # UI/Templating + Feature protocol
-from jinja2 import Template
+from jinja2 import DictLoader, Environment
 from app.core.contracts.feature_interface import BaseFeature
 from app.core.easy_options import EasyOptions
 
@@ -115,11 +135,27 @@ except Exception:  # headless or unavailable
     _simpledialog = None
 
 
+# Optional: orjson serializes in C (with indent); stdlib fallback stays on json's C fast path by skipping indent
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def _dumps(obj) -> str:
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
 # -----------------------------
 # Normalized result structure
 # -----------------------------
-@dataclass
+@dataclass(frozen=True)
 class SteghideResult:
+    # Spelled out instead of dataclass(slots=True), which needs Python 3.10; the fields have no defaults to clash with
+    __slots__ = ("tool", "ok", "action", "file", "cmd", "info", "extracted", "errors", "raw", "notes")
+
     tool: str
     ok: bool
     action: str  # "info" | "extract"
@@ -131,36 +167,40 @@ class SteghideResult:
     raw: Dict[str, str]
     notes: List[str]
 
-    def to_dict(self) -> Dict:
-        return {
-            "tool": self.tool,
-            "ok": self.ok,
-            "action": self.action,
-            "file": self.file,
-            "cmd": self.cmd,
-            "info": self.info,
-            "extracted": self.extracted,
-            "errors": self.errors,
-            "raw": self.raw,
-            "notes": self.notes,
-        }
+    @staticmethod
+    def _error(action: str, file: str, errors: str, notes: List[str], cmd: Sequence[str] = ()) -> SteghideResult:
+        """Failed result with empty info/extracted/raw fields."""
+        return SteghideResult(
+            tool="steghide",
+            ok=False,
+            action=action,
+            file=file,
+            cmd=list(cmd),
+            info={},
+            extracted=[],
+            errors=errors,
+            raw={"stdout": "", "stderr": ""},
+            notes=notes,
+        )
 
 
 # -----------------------------
 # Helpers
 # -----------------------------
-def _is_windows() -> bool:
-    return platform.system() == "Windows"
+# The platform can't change while we run, so decide once at import
+_IS_WINDOWS = platform.system() == "Windows"
 
 
+@functools.lru_cache(maxsize=1)
 def _detect_runtime() -> Tuple[str, Optional[List[str]], List[str]]:
     """
+    Cached for the session (PATH rarely changes); cleared in Feature.shutdown(). Callers must not mutate the lists.
     Returns (mode, base_cmd, notes)
     mode: "native" | "wsl" | "unix" | "missing"
     base_cmd: list like ["steghide"] or ["wsl", "-e", "steghide"]
     """
     notes: List[str] = []
-    if _is_windows():
+    if _IS_WINDOWS:
         exe = shutil.which("steghide.exe") or shutil.which("steghide")
         if exe:
             return "native", [exe], notes
@@ -178,32 +218,241 @@ def _detect_runtime() -> Tuple[str, Optional[List[str]], List[str]]:
         return "missing", None, notes
 
 
+@functools.lru_cache(maxsize=512)
 def _to_wsl_path(win_path: str) -> str:
     """
     Convert 'C:\\path\\to\\file' -> '/mnt/c/path/to/file' for WSL calls.
     """
+    # Fast path for the usual "C:\\..." form: slice the drive letter instead of splitdrive + two replace passes
+    if len(win_path) >= 2 and win_path[1] == ":":
+        rest = win_path[2:].replace("\\", "/")
+        return f"/mnt/{win_path[0].lower()}{rest}"
     drive, rest = os.path.splitdrive(win_path)
     drive_letter = drive.replace(":", "").lower()
     path = rest.replace("\\", "/")
     return f"/mnt/{drive_letter}{path}"
 
 
-def _maybe_wsl_path(mode: str, p: str) -> str:
-    if mode == "wsl" and _is_windows():
-        return _to_wsl_path(os.path.abspath(p))
-    return p
+# Specialized at import: off Windows there is never a path to translate
+if _IS_WINDOWS:
+    def _maybe_wsl_path(mode: str, p: str) -> str:
+        if mode == "wsl":
+            # Absolutize first so the memoized translation is keyed on one canonical form per file
+            return _to_wsl_path(os.path.abspath(p))
+        return p
+else:
+    def _maybe_wsl_path(mode: str, p: str) -> str:
+        return p
+
+
+# Opt-in: keep one `wsl -e bash` alive and feed it commands instead of paying wsl.exe startup per call.
+# Off by default because it leaves a background process running until shutdown().
+_PERSISTENT_WSL_ENABLED = os.environ.get("STEGHIDE_PERSISTENT_WSL", "").lower() in ("1", "true", "yes")
+
+
+class _ShellRetired(Exception):
+    """
+    The shell was killed after another command timed out; the caller should start a fresh one.
+    """
+
+
+class _PersistentWSL:
+    """
+    Long-lived `wsl -e bash` session. Each command's stdout and stderr come back framed by sentinel lines:
+      <stdout>\n___END___ <rc>\n<stderr>\n___END___\n
+    """
+    _END = "___END___"
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            ["wsl", "-e", "bash"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            # Bytes, not text=True: Windows text-mode pipes turn "\n" into "\r\n", and bash would then see
+            # `rm -f "$__err"\r` (leaking a mktemp file per call) and a stray \r in the sentinel printf
+            close_fds=True,
+        )
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._retired = False
+        # Windows pipes can't be select()ed, so a reader thread feeds lines to run_cmd with a timeout
+        threading.Thread(target=self._pump, daemon=True).start()
+
+    def _pump(self) -> None:
+        for line in self.proc.stdout:
+            self._lines.put(line.decode("utf-8", errors="replace"))
+        self._lines.put(None)
+
+    def _read_until(self, prefix: str, deadline: float, argv: List[str], timeout: int) -> Tuple[str, str]:
+        out: List[str] = []
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                line = self._lines.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(argv, timeout)
+            if line is None:
+                raise RuntimeError("Persistent WSL shell exited unexpectedly.")
+            if line.startswith(prefix):
+                # Drop the newline we printed in front of the sentinel
+                return "".join(out)[:-1], line[len(prefix):].strip()
+            out.append(line)
+
+    def run_cmd(self, argv: List[str], timeout: int = 60) -> subprocess.CompletedProcess:
+        script = (
+            f'__err=$(mktemp); {shlex.join(argv)} </dev/null 2>"$__err"; __rc=$?; '
+            f'printf "\\n{self._END} %s\\n" "$__rc"; cat "$__err"; printf "\\n{self._END}\\n"; rm -f "$__err"\n'
+        )
+        with self._lock:
+            if self._retired:
+                raise _ShellRetired()
+            deadline = time.monotonic() + timeout
+            self.proc.stdin.write(script.encode("utf-8"))
+            self.proc.stdin.flush()
+            try:
+                stdout, rc = self._read_until(self._END + " ", deadline, argv, timeout)
+                stderr, _ = self._read_until(self._END, deadline, argv, timeout)
+            except subprocess.TimeoutExpired:
+                # Retire before releasing the lock so the next caller can't read this command's leftover
+                # output and sentinel as its own
+                self._retired = True
+                self.proc.kill()
+                raise
+        return subprocess.CompletedProcess(argv, int(rc), stdout, stderr)
+
+    def alive(self) -> bool:
+        return not self._retired and self.proc.poll() is None
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except Exception:
+            self.proc.kill()
+
+
+_wsl_shell: Optional[_PersistentWSL] = None
+_WSL_SHELL_LOCK = threading.Lock()
+
+
+def _run_persistent_wsl(cmd: List[str], timeout: int) -> subprocess.CompletedProcess:
+    """
+    Run a `wsl -e ...` command through the shared shell; a timed-out shell is discarded and respawned next time.
+    """
+    global _wsl_shell
+    while True:
+        with _WSL_SHELL_LOCK:
+            if _wsl_shell is None or not _wsl_shell.alive():
+                _wsl_shell = _PersistentWSL()
+            shell = _wsl_shell
+        try:
+            return shell.run_cmd(cmd[2:], timeout=timeout)
+        except _ShellRetired:
+            # Another command timed out and killed this shell while we waited for it
+            continue
+        except subprocess.TimeoutExpired:
+            with _WSL_SHELL_LOCK:
+                if _wsl_shell is shell:
+                    _wsl_shell = None
+            raise
+
+
+def _close_persistent_wsl() -> None:
+    global _wsl_shell
+    with _WSL_SHELL_LOCK:
+        if _wsl_shell is not None:
+            _wsl_shell.close()
+            _wsl_shell = None
 
 
 def _run(cmd: List[str], cwd: Optional[str] = None, timeout: int = 60) -> subprocess.CompletedProcess:
-    return subprocess.run(
+    # WSL paths are absolute (/mnt/...), so cwd isn't needed inside the shared shell
+    if _PERSISTENT_WSL_ENABLED and cmd[:2] == ["wsl", "-e"]:
+        return _run_persistent_wsl(cmd, timeout)
+    proc = subprocess.Popen(
         cmd,
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True,
-        timeout=timeout,
         cwd=cwd,
         stdin=subprocess.DEVNULL,
         shell=False,
+        close_fds=True,  # no preexec_fn/pass_fds/start_new_session: keeps the vfork fast path on Linux
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        # Ask nicely first so steghide (or wsl.exe) can clean up, then make sure nothing is left behind
+        proc.terminate()
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        raise
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+# Info finishes in well under a second on real files; extract scales with the cover size.
+# WSL calls get extra headroom for a cold VM start.
+_INFO_TIMEOUT = 10
+_WSL_STARTUP_GRACE = 10
+
+
+def _extract_timeout(size: int) -> int:
+    return max(15, (size // (1024 * 1024)) * 2)
+
+
+def _stat_file(file_path: str) -> Optional[os.stat_result]:
+    """
+    One stat per action: returns the stat result for a regular file (None otherwise), which then supplies
+    the size for timeouts/staging and the cache key.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+# WSL2 reads /mnt/c through a network-like 9P share; cover files above this size are copied to /tmp first
+_WSL2_STAGE_THRESHOLD = 8 * 1024 * 1024
+_wsl2: Optional[bool] = None
+
+
+def _is_wsl2() -> bool:
+    """
+    Probe the WSL kernel once: WSL2 kernels report 'microsoft-standard' in `uname -r`, WSL1 does not.
+    """
+    global _wsl2
+    if _wsl2 is None:
+        try:
+            proc = _run(["wsl", "-e", "sh", "-c", "uname -r"], timeout=15)
+            _wsl2 = "microsoft-standard" in (proc.stdout or "").lower()
+        except Exception:
+            _wsl2 = False
+    return _wsl2
+
+
+def _should_stage(mode: str, size: int) -> bool:
+    return mode == "wsl" and size > _WSL2_STAGE_THRESHOLD and _is_wsl2()
+
+
+def _staged_wsl_cmd(cmd: List[str], file_arg: str) -> List[str]:
+    """
+    Wrap a `wsl -e steghide ...` command so steghide reads a /tmp copy of file_arg.
+    Copy, run and cleanup happen in one wsl invocation; the exit code is steghide's (or cp's if the copy failed).
+    The copy gets its own mktemp name because pywebview runs concurrent API calls on separate threads.
+    """
+    # Keep the extension: steghide picks the cover format from it
+    suffix = shlex.quote("--suffix=" + os.path.splitext(file_arg)[1])
+    argv = " ".join('"$staged"' if a == file_arg else shlex.quote(a) for a in cmd[2:])
+    script = (
+        f"staged=$(mktemp {suffix}) || exit 1; trap 'rm -f \"$staged\"' EXIT; "
+        f"cp {shlex.quote(file_arg)} \"$staged\" && {argv}"
     )
+    return ["wsl", "-e", "bash", "-c", script]
 
 
 def _parse_keyvals(text: str) -> Dict[str, str]:
@@ -212,28 +461,151 @@ def _parse_keyvals(text: str) -> Dict[str, str]:
     """
     info: Dict[str, str] = {}
     for line in text.splitlines():
-        m = re.match(r"\s*([^:]+)\s*:\s*(.+)\s*$", line)
-        if m:
-            k = m.group(1).strip()
-            v = m.group(2).strip()
-            info[k] = v
+        key, sep, value = line.partition(":")
+        key, value = key.strip(), value.strip()
+        if sep and key and value:
+            info[key] = value
     return info
 
 
+# Known steghide messages that warrant a hint; the group name says which one matched
+_HINT_RE = re.compile(
+    r"(?P<bmp_v5>format that is not supported|biSize: 124)"
+    r"|(?P<wrong_pass>could not extract any data|wrong pass(?:phrase)?)",
+    re.IGNORECASE,
+)
+
+
+def _scan_hints(stdout: str, stderr: str) -> Tuple[bool, bool]:
+    """
+    One regex pass over each stream (no concatenated copy). Returns (bmp_v5, wrong_pass).
+    """
+    found = {m.lastgroup for text in (stdout, stderr) if text for m in _HINT_RE.finditer(text)}
+    return "bmp_v5" in found, "wrong_pass" in found
+
+
+# Successful Info results keyed by (abspath, st_mtime_ns, st_size, passphrase); the passphrase is part of the key
+# because it changes what steghide reports. LRU-bounded, cleared in Feature.shutdown().
+_INFO_CACHE: OrderedDict[Tuple[str, int, int, str], SteghideResult] = OrderedDict()
+_INFO_CACHE_MAX = 64
+_INFO_CACHE_LOCK = threading.Lock()  # _run_info_many workers read and fill the cache concurrently
+
+
+def _info_cache_key(abs_path: str, st: Optional[os.stat_result], pw: str) -> Optional[Tuple[str, int, int, str]]:
+    if st is None:
+        return None
+    return abs_path, st.st_mtime_ns, st.st_size, pw
+
+
+def _info_cache_get(key: Optional[Tuple[str, int, int, str]]) -> Optional[SteghideResult]:
+    if key is None:
+        return None
+    with _INFO_CACHE_LOCK:
+        res = _INFO_CACHE.get(key)
+        if res is not None:
+            _INFO_CACHE.move_to_end(key)
+        return res
+
+
+def _info_cache_put(key: Optional[Tuple[str, int, int, str]], res: SteghideResult) -> None:
+    if key is None or not res.ok:
+        return
+    with _INFO_CACHE_LOCK:
+        _INFO_CACHE[key] = res
+        _INFO_CACHE.move_to_end(key)
+        while len(_INFO_CACHE) > _INFO_CACHE_MAX:
+            _INFO_CACHE.popitem(last=False)
+
+
+def _info_result(file_path: str, cmd: List[str], returncode: int, stdout: str, stderr: str, notes: List[str]) -> SteghideResult:
+    """
+    Build the normalized result for one `steghide info -v` run (shared by single and batch info).
+    """
+    info = _parse_keyvals(stdout)
+    ok = returncode == 0
+    bmp_v5, wrong_pass = _scan_hints(stdout, stderr)
+
+    # Detect common issues and add hints
+    if bmp_v5:
+        notes.append("BMP V5 detected; convert to BMP3: convert input.bmp bmp3:output_v3.bmp")
+
+    if not ok and wrong_pass:
+        notes.append("Possible wrong/empty passphrase or no embedded payload.")
+
+    return SteghideResult(
+        tool="steghide",
+        ok=ok,
+        action="info",
+        file=file_path,
+        cmd=cmd,
+        info=info,
+        extracted=[],
+        errors=None if ok else (stderr or "Non-zero exit status"),
+        raw={"stdout": stdout, "stderr": stderr},
+        notes=notes,
+    )
+
+
+# Sentinels printed after each file in a batch loop: "\n<marker> <exit code>\n" on stdout, "\n<marker>\n" on stderr.
+# The leading newline keeps output without a trailing newline from swallowing the marker; the regex consumes it again.
+_BATCH_SPLIT = "---SPLIT---"
+_BATCH_SPLIT_RE = re.compile(re.escape("\n" + _BATCH_SPLIT) + r" (\d+)\n")
+
+
+# Keep each `bash -c` script well under the Windows command-line limit
+_BATCH_MAX_CMD = 10000
+
+
+def _batch_chunks(file_args: List[str], file_paths: List[str], budget: int) -> List[List[str]]:
+    """
+    Group file_paths so the quoted WSL file args of each chunk stay within budget characters.
+    """
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+    for arg, path in zip(file_args, file_paths):
+        size = len(shlex.quote(arg)) + 1
+        if current and used + size > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(path)
+        used += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _batch_info_script(steghide: str, file_args: List[str], pw: str) -> str:
+    """
+    One shell loop running `steghide info` over every file, so WSL starts only once.
+    """
+    files = " ".join(shlex.quote(f) for f in file_args)
+    return (
+        f"for f in {files}; do "
+        f"{shlex.quote(steghide)} info -v -sf \"$f\" -p {shlex.quote(pw)}; rc=$?; "
+        f"printf '\\n%s %s\\n' {shlex.quote(_BATCH_SPLIT)} \"$rc\"; printf '\\n%s\\n' {shlex.quote(_BATCH_SPLIT)} >&2; "
+        f"done"
+    )
+
+
 def _prompt_passphrase(title="Steghide", prompt="Enter passphrase (leave blank for none):") -> str:
     if _tk is None or _simpledialog is None:
         return ""
     try:
+        # Created and destroyed on the calling thread: pywebview runs each API call on a fresh thread,
+        # and a Tk root must never outlive (or be torn down from outside) the thread that made it
         root = _tk.Tk()
         root.withdraw()
-        pw = _simpledialog.askstring(title, prompt, show="*")
-        root.destroy()
+        try:
+            pw = _simpledialog.askstring(title, prompt, show="*", parent=root)
+        finally:
+            root.destroy()
         return pw or ""
     except Exception:
         return ""
 
 
-_HTML_TEMPLATE = Template(
+_HTML_SOURCE = (
     """
 <div class="panel">
   <h2>Steghide – {{ result.action|capitalize }} ({{ "OK" if result.ok else "Failed" }})</h2>
@@ -270,7 +642,7 @@ _HTML_TEMPLATE = Template(
     {% if result.extracted %}
       <ul>
       {% for p in result.extracted %}
-        <li><code>{{ p }}</code></li>
+        <li><code>{{ p }}</code>{% if result.info.extracted_size %} ({{ result.info.extracted_size }} bytes){% endif %}</li>
       {% endfor %}
       </ul>
     {% else %}
@@ -297,7 +669,7 @@ _HTML_TEMPLATE = Template(
 )
 
 
-_HELP_HTML = Template(
+_HELP_SOURCE = (
     """
 <div class="panel">
   <h2>Steghide – Help</h2>
@@ -314,6 +686,18 @@ _HELP_HTML = Template(
 """
 )
 
+# Compiled once into one Environment (no reload checks, unbounded cache); results are rendered straight from
+# the dataclass via attribute access instead of building a dict per render. Autoescape: raw tool output and
+# findings come from untrusted files and end up in the webview's DOM.
+_TEMPLATES = Environment(
+    autoescape=True,
+    loader=DictLoader({"steghide_result": _HTML_SOURCE, "steghide_help": _HELP_SOURCE}),
+    auto_reload=False,
+    cache_size=-1,
+)
+_HTML_TEMPLATE = _TEMPLATES.get_template("steghide_result")
+_HELP_HTML = _TEMPLATES.get_template("steghide_help")
+
 
 # =============================
 # Feature Implementation
@@ -355,6 +739,9 @@ class Feature(BaseFeature):
         return True
 
     def shutdown(self) -> None:
+        _close_persistent_wsl()
+        _detect_runtime.cache_clear()
+        _INFO_CACHE.clear()
         print("[steghide] Shutdown called.")
 
     #
@@ -365,179 +752,268 @@ class Feature(BaseFeature):
 
     def option_info_html(self, params: dict) -> str:
         res = self._run_info(params)
-        return _HTML_TEMPLATE.render(result=res.to_dict())
+        return _HTML_TEMPLATE.render(result=res)
 
     def option_extract_html(self, params: dict) -> str:
         res = self._run_extract(params)
-        return _HTML_TEMPLATE.render(result=res.to_dict())
+        return _HTML_TEMPLATE.render(result=res)
 
     def option_info_json(self, params: dict) -> str:
         res = self._run_info(params)
-        return "<pre>" + json.dumps(res.to_dict(), indent=2) + "</pre>"
+        return "<pre>" + html.escape(_dumps(asdict(res)), quote=False) + "</pre>"
 
     def option_extract_json(self, params: dict) -> str:
         res = self._run_extract(params)
-        return "<pre>" + json.dumps(res.to_dict(), indent=2) + "</pre>"
+        return "<pre>" + html.escape(_dumps(asdict(res)), quote=False) + "</pre>"
 
     #
     # Core actions
     #
-    def _run_info(self, params: dict) -> SteghideResult:
+    def _run_info(self, params: dict, timeout: Optional[int] = None) -> SteghideResult:
         file_path = (params or {}).get("file_path") or ""
         notes: List[str] = []
 
-        if not file_path or not os.path.isfile(file_path):
-            return SteghideResult(
-                tool="steghide",
-                ok=False,
-                action="info",
-                file=file_path,
-                cmd=[],
-                info={},
-                extracted=[],
-                errors="No file selected or invalid path.",
-                raw={"stdout": "", "stderr": ""},
-                notes=["Select a valid file first."],
-            )
+        # One stat both validates the path and keys the Info cache / staging decision
+        st = _stat_file(file_path) if file_path else None
+        if st is None:
+            return SteghideResult._error("info", file_path, "No file selected or invalid path.", ["Select a valid file first."])
 
         # Detect runtime
         mode, base_cmd, detect_notes = _detect_runtime()
         notes.extend(detect_notes)
         if not base_cmd:
-            return SteghideResult(
-                tool="steghide",
-                ok=False,
-                action="info",
-                file=file_path,
-                cmd=[],
-                info={},
-                extracted=[],
-                errors="steghide runtime not found (native or WSL).",
-                raw={"stdout": "", "stderr": ""},
-                notes=notes,
-            )
+            return SteghideResult._error("info", file_path, "steghide runtime not found (native or WSL).", notes)
+
+        # Optional passphrase: batch callers pass the one they already prompted for
+        pw = (params or {}).get("passphrase")
+        if pw is None:
+            pw = _prompt_passphrase(title="Steghide Info", prompt="Enter passphrase (leave blank for none):")
+
+        return self._info_one(file_path, st, mode, base_cmd, pw, notes, timeout)
+
+    def _info_one(
+        self,
+        file_path: str,
+        st: Optional[os.stat_result],
+        mode: str,
+        base_cmd: List[str],
+        pw: str,
+        notes: List[str],
+        timeout: Optional[int] = None,
+    ) -> SteghideResult:
+        """
+        Info for one file once the caller has validated it, detected the runtime and obtained the passphrase,
+        so batch callers do those steps once for all files.
+        """
+        abs_path = os.path.abspath(file_path)
+        parent = os.path.dirname(abs_path)
 
-        # Optional passphrase (prompt)
-        pw = _prompt_passphrase(title="Steghide Info", prompt="Enter passphrase (leave blank for none):")
+        # Unchanged file + same passphrase: reuse the previous successful result
+        key = _info_cache_key(abs_path, st, pw)
+        cached = _info_cache_get(key)
+        if cached is not None:
+            return cached
 
-        file_arg = _maybe_wsl_path(mode, file_path)
+        file_arg = _maybe_wsl_path(mode, abs_path)
         cmd = base_cmd + ["info", "-v", "-sf", file_arg]
         # Always pass -p to prevent interactive prompts
         cmd += ["-p", pw]
+        if timeout is None:
+            timeout = _INFO_TIMEOUT
+        if mode == "wsl":
+            timeout += _WSL_STARTUP_GRACE
+            if _should_stage(mode, st.st_size if st else 0):
+                cmd = _staged_wsl_cmd(cmd, file_arg)
+                notes.append("WSL2 detected; large cover file copied to /tmp inside WSL before running steghide.")
 
         try:
-            proc = _run(cmd, cwd=os.path.dirname(file_path))
-            stdout, stderr = proc.stdout, proc.stderr
+            proc = _run(cmd, cwd=parent, timeout=timeout)
+            res = _info_result(file_path, cmd, proc.returncode, proc.stdout, proc.stderr, notes)
+            _info_cache_put(key, res)
+            return res
 
-            info = _parse_keyvals(stdout)
-            ok = proc.returncode == 0
-
-            # Detect common issues and add hints
-            if "has a format that is not supported" in stdout or "biSize: 124" in stdout or "biSize: 124" in stderr:
-                notes.append("BMP V5 detected; convert to BMP3: convert input.bmp bmp3:output_v3.bmp")
+        except subprocess.TimeoutExpired:
+            return SteghideResult._error("info", file_path, "Timeout while running steghide info.", notes, cmd)
+        except Exception as e:
+            return SteghideResult._error("info", file_path, f"Error running steghide info: {e}", notes, cmd)
 
-            if not ok and ("could not extract any data" in stdout or "wrong passphrase" in stdout.lower()):
-                notes.append("Possible wrong/empty passphrase or no embedded payload.")
+    def run_batch(self, params: dict) -> List[SteghideResult]:
+        """
+        Run Info over params["file_paths"] (falls back to params["file_path"]) with a single passphrase prompt.
+        Native/unix runtimes scan the files concurrently on a thread pool.
+        In WSL mode files go through one `wsl -e bash -c` loop per ~10k chars of paths, paying the wsl.exe startup once per chunk.
+        """
+        params = params or {}
+        file_paths = list(params.get("file_paths") or [])
+        if not file_paths and params.get("file_path"):
+            file_paths = [params["file_path"]]
+        if not file_paths:
+            return [self._run_info(params)]
+
+        results: Dict[str, SteghideResult] = {}
+        valid: List[str] = []
+        stats: Dict[str, os.stat_result] = {}
+        for file_path in file_paths:
+            st = _stat_file(file_path)
+            if st is not None:
+                valid.append(file_path)
+                stats[file_path] = st
+            else:
+                results[file_path] = SteghideResult._error("info", file_path, "No file selected or invalid path.", ["Select a valid file first."])
 
-            return SteghideResult(
-                tool="steghide",
-                ok=ok,
-                action="info",
-                file=file_path,
-                cmd=cmd,
-                info=info,
-                extracted=[],
-                errors=None if ok else (stderr or "Non-zero exit status"),
-                raw={"stdout": stdout, "stderr": stderr},
-                notes=notes,
-            )
+        mode, base_cmd, detect_notes = _detect_runtime()
+        if not base_cmd:
+            for file_path in valid:
+                results[file_path] = SteghideResult._error("info", file_path, "steghide runtime not found (native or WSL).", list(detect_notes))
+            return [results[f] for f in file_paths]
+
+        if valid:
+            pw = params.get("passphrase")
+            if pw is None:
+                pw = _prompt_passphrase(title="Steghide Batch Info", prompt="Enter passphrase (leave blank for none):")
+
+            if mode == "wsl":
+                budget = _BATCH_MAX_CMD - len(_batch_info_script("steghide", [], pw))
+                for chunk in _batch_chunks([_maybe_wsl_path(mode, f) for f in valid], valid, budget):
+                    results.update(self._run_info_wsl_loop(chunk, pw, detect_notes))
+            else:
+                results.update(zip(valid, self._run_info_many(valid, pw, mode, base_cmd, detect_notes, stats=stats)))
+
+        return [results[f] for f in file_paths]
+
+    def _run_info_many(
+        self,
+        paths: List[str],
+        pw: str,
+        mode: str,
+        base_cmd: List[str],
+        detect_notes: List[str],
+        max_workers: Optional[int] = None,
+        stats: Optional[Dict[str, Optional[os.stat_result]]] = None,
+    ) -> List[SteghideResult]:
+        """
+        Run Info over already-validated paths on a thread pool; the threads mostly wait on steghide with the GIL released.
+        Runtime detection and the passphrase prompt happen once in the caller (tkinter must stay on one thread).
+        """
+        if not paths:
+            return []
+        stats = stats or {}
+        workers = min(len(paths), max_workers or os.cpu_count() or 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(
+                lambda p: self._info_one(p, stats.get(p), mode, base_cmd, pw, list(detect_notes)),
+                paths,
+            ))
+
+    def _run_info_wsl_loop(self, file_paths: List[str], pw: str, detect_notes: List[str]) -> Dict[str, SteghideResult]:
+        """
+        Execute a single WSL bash loop over all files and split its output on the per-file sentinels.
+        """
+        file_args = [_maybe_wsl_path("wsl", f) for f in file_paths]
+        cmd = ["wsl", "-e", "bash", "-c", _batch_info_script("steghide", file_args, pw)]
 
+        try:
+            proc = _run(cmd, timeout=_INFO_TIMEOUT * len(file_paths) + _WSL_STARTUP_GRACE)
+            stdout, stderr = proc.stdout or "", proc.stderr or ""
+            error = None
         except subprocess.TimeoutExpired:
-            return SteghideResult(
-                tool="steghide",
-                ok=False,
-                action="info",
-                file=file_path,
-                cmd=cmd,
-                info={},
-                extracted=[],
-                errors="Timeout while running steghide info.",
-                raw={"stdout": "", "stderr": ""},
-                notes=notes,
-            )
+            stdout, stderr, error = "", "", "Timeout while running steghide batch info."
         except Exception as e:
-            return SteghideResult(
-                tool="steghide",
-                ok=False,
-                action="info",
-                file=file_path,
-                cmd=cmd,
-                info={},
-                extracted=[],
-                errors=f"Error running steghide info: {e}",
-                raw={"stdout": "", "stderr": ""},
-                notes=notes,
-            )
-
-    def _run_extract(self, params: dict) -> SteghideResult:
+            stdout, stderr, error = "", "", f"Error running steghide batch info: {e}"
+
+        # ["out0", "rc0", "out1", "rc1", ..., trailing]
+        pieces = _BATCH_SPLIT_RE.split(stdout)
+        outs, codes = pieces[0:-1:2], pieces[1::2]
+        errs = stderr.split("\n" + _BATCH_SPLIT + "\n")
+
+        results: Dict[str, SteghideResult] = {}
+        for i, (file_path, file_arg) in enumerate(zip(file_paths, file_args)):
+            file_cmd = ["wsl", "-e", "steghide", "info", "-v", "-sf", file_arg, "-p", pw]
+            notes = list(detect_notes)
+            if i >= len(codes):
+                # Loop aborted (timeout, WSL failure) before reaching this file
+                results[file_path] = SteghideResult._error("info", file_path, error or (stderr or "Batch run ended before this file was processed."), notes, file_cmd)
+                continue
+            err = errs[i] if i < len(errs) else ""
+            results[file_path] = _info_result(file_path, file_cmd, int(codes[i]), outs[i], err, notes)
+        return results
+
+    def _run_extract(self, params: dict, timeout: Optional[int] = None) -> SteghideResult:
         file_path = (params or {}).get("file_path") or ""
         notes: List[str] = []
 
-        if not file_path or not os.path.isfile(file_path):
-            return SteghideResult(
-                tool="steghide",
-                ok=False,
-                action="extract",
-                file=file_path,
-                cmd=[],
-                info={},
-                extracted=[],
-                errors="No file selected or invalid path.",
-                raw={"stdout": "", "stderr": ""},
-                notes=["Select a valid file first."],
-            )
+        # One stat both validates the path and keys the Info cache / staging decision
+        st = _stat_file(file_path) if file_path else None
+        if st is None:
+            return SteghideResult._error("extract", file_path, "No file selected or invalid path.", ["Select a valid file first."])
 
         # Detect runtime
         mode, base_cmd, detect_notes = _detect_runtime()
         notes.extend(detect_notes)
         if not base_cmd:
-            return SteghideResult(
-                tool="steghide",
-                ok=False,
-                action="extract",
-                file=file_path,
-                cmd=[],
-                info={},
-                extracted=[],
-                errors="steghide runtime not found (native or WSL).",
-                raw={"stdout": "", "stderr": ""},
-                notes=notes,
-            )
-
-        # Ask passphrase (blank allowed)
-        pw = _prompt_passphrase(title="Steghide Extract", prompt="Enter passphrase (leave blank for none):")
-
+            return SteghideResult._error("extract", file_path, "steghide runtime not found (native or WSL).", notes)
+
+        # Ask passphrase (blank allowed) unless the caller supplied one, e.g. a wordlist loop
+        pw = (params or {}).get("passphrase")
+        if pw is None:
+            pw = _prompt_passphrase(title="Steghide Extract", prompt="Enter passphrase (leave blank for none):")
+
+        return self._extract_one(file_path, st, mode, base_cmd, pw, notes, timeout)
+
+    def _extract_one(
+        self,
+        file_path: str,
+        st: Optional[os.stat_result],
+        mode: str,
+        base_cmd: List[str],
+        pw: str,
+        notes: List[str],
+        timeout: Optional[int] = None,
+    ) -> SteghideResult:
+        """
+        Extract from one already-validated file with a known runtime and passphrase.
+        """
         # We will force an explicit output file in the same folder,
         # so extraction is deterministic and cross-platform.
-        out_dir = os.path.dirname(os.path.abspath(file_path))
+        abs_path = os.path.abspath(file_path)
+        out_dir = os.path.dirname(abs_path)
         out_name = "steghide_extracted.bin"
         out_path = os.path.join(out_dir, out_name)
 
-        file_arg = _maybe_wsl_path(mode, file_path)
+        file_arg = _maybe_wsl_path(mode, abs_path)
         out_arg = _maybe_wsl_path(mode, out_path)
 
         cmd = base_cmd + ["extract", "-sf", file_arg, "-xf", out_arg, "-f", "-p", pw]
+        size = st.st_size if st else 0
+        if timeout is None:
+            timeout = _extract_timeout(size)
+        if mode == "wsl":
+            timeout += _WSL_STARTUP_GRACE
+        if _should_stage(mode, size):
+            # Only the cover file is staged; the payload is usually small and is written straight to out_arg
+            cmd = _staged_wsl_cmd(cmd, file_arg)
+            notes.append("WSL2 detected; large cover file copied to /tmp inside WSL before running steghide.")
 
         try:
-            proc = _run(cmd, cwd=os.path.dirname(file_path))
+            proc = _run(cmd, cwd=out_dir, timeout=timeout)
             stdout, stderr = proc.stdout, proc.stderr
-            ok = proc.returncode == 0 and os.path.exists(out_path)
+
+            # One stat: confirms a non-empty regular file and gives the size for the UI
+            info: Dict[str, str] = {}
+            try:
+                out_st = os.stat(out_path)
+                ok = proc.returncode == 0 and stat.S_ISREG(out_st.st_mode) and out_st.st_size > 0
+                if ok:
+                    info["extracted_size"] = str(out_st.st_size)
+            except FileNotFoundError:
+                ok = False
 
             # Detect common issues
-            if ("format that is not supported" in stdout) or ("biSize: 124" in stdout + stderr):
+            bmp_v5, wrong_pass = _scan_hints(stdout, stderr)
+            if bmp_v5:
                 notes.append("BMP V5 detected; convert to BMP3: convert input.bmp bmp3:output_v3.bmp")
 
-            if not ok and ("could not extract any data" in (stdout + stderr).lower() or "wrong pass" in (stdout + stderr).lower()):
+            if not ok and wrong_pass:
                 notes.append("Possible wrong/empty passphrase or no embedded payload.")
 
             extracted = [out_path] if ok else []
@@ -548,7 +1024,7 @@ class Feature(BaseFeature):
                 action="extract",
                 file=file_path,
                 cmd=cmd,
-                info={},
+                info=info,
                 extracted=extracted,
                 errors=None if ok else (stderr or "Extraction failed or produced no file"),
                 raw={"stdout": stdout, "stderr": stderr},
@@ -556,31 +1032,9 @@ class Feature(BaseFeature):
             )
 
         except subprocess.TimeoutExpired:
-            return SteghideResult(
-                tool="steghide",
-                ok=False,
-                action="extract",
-                file=file_path,
-                cmd=cmd,
-                info={},
-                extracted=[],
-                errors="Timeout while running steghide extract.",
-                raw={"stdout": "", "stderr": ""},
-                notes=notes,
-            )
+            return SteghideResult._error("extract", file_path, "Timeout while running steghide extract.", notes, cmd)
         except Exception as e:
-            return SteghideResult(
-                tool="steghide",
-                ok=False,
-                action="extract",
-                file=file_path,
-                cmd=cmd,
-                info={},
-                extracted=[],
-                errors=f"Error running steghide extract: {e}",
-                raw={"stdout": "", "stderr": ""},
-                notes=notes,
-            )
+            return SteghideResult._error("extract", file_path, f"Error running steghide extract: {e}", notes, cmd)
 
 
 
@@ -6,8 +6,8 @@
 #
 # Architecture & Modularity:
 # - Feature(BaseFeature): Implements the feature contract for FeatureManager. Provides EasyOptions callbacks and a sensible default action.
-# - ZstegResult (dataclass): Normalized container for output (action, ok, cmd, findings, output_files, raw, notes). Exposed via to_dict().
-# - Templating: Uses jinja2.Template for HTML panels (Scan/Extract results) and Help panel.
+# - ZstegResult (dataclass): Normalized container for output (action, ok, cmd, findings, output_files, raw, notes). Uses slots; exposed via to_dict() (shallow attrgetter dump).
+# - Templating: Uses a jinja2 Environment (DictLoader, compiled once at import) for HTML panels (Scan/Extract results) and Help panel.
 #
 # Contracts used:
 # - app.core.contracts.feature_interface.BaseFeature
@@ -15,18 +15,22 @@
 #
 # Modularity:
 # - Plug-in style: register() returns { instance, self_test, shutdown, easy_options }.
-# - Stateless execution: inputs are passed via params: dict (e.g., file_path, optionally channel, output_name).
+# - Stateless execution: inputs are passed via params: dict (e.g., file_path, optionally channel, output_name, timeout).
 #
 # Platform Awareness & External Dependencies:
 # - Binary: zsteg (Ruby gem).
 # - Windows native: uses zsteg if found in PATH.
 # - Windows fallback: if not found, uses WSL (wsl -e zsteg) and converts paths to /mnt/....
 # - Linux/macOS: executes zsteg directly.
+# - ZSTEG_PERSISTENT=1: scans go through one long-lived Ruby worker (zsteg_worker.rb) that loads the gem once, instead of
+#   starting Ruby per file; scans then run one at a time. If the worker can't start, scans fall back to direct zsteg runs.
 # - If neither native nor WSL is available, the feature returns a graceful error with install hints.
 #
 # Commands Executed:
-# - Scan: zsteg -a <file> (aggressive scan). Output is parsed to surface likely hits (channels + short description), while the full raw output is preserved.
-# - Extract: zsteg -E <channel> <file> (bytes on stdout; module writes to disk). If no channel is provided in params, a tiny tkinter prompt asks for one (if available). Output is saved as zsteg_extract.bin next to the input (or to params["output_name"] if given).
+# - Scan: zsteg -a <file> (aggressive scan). Output is streamed and parsed line by line to surface likely hits (channels + short description);
+#   the first ~5 MB of raw output plus its last 32 KB are kept in memory (nothing is written to disk);
+#   the raw view itself shows the first and last 32 KB.
+# - Extract: zsteg -E <channel> <file> (stdout is attached straight to a temp file beside the output, renamed into place on success). If no channel is provided in params, a tiny tkinter prompt asks for one (if available). Output is saved as zsteg_extract.bin next to the input (or to params["output_name"] if given).
 #
 # EasyOptions (UI):
 # Option ID      Label           Action
@@ -35,7 +39,10 @@
 # extract_html   Extract (HTML)  Runs zsteg -E, renders HTML
 # scan_json      Scan (JSON)     Returns normalized dict as JSON
 # extract_json   Extract (JSON)  Returns normalized dict as JSON
+# - JSON uses orjson (indented) when installed, otherwise compact stdlib json.
 # - run_default() calls Scan (HTML).
+# - Feature.run_batch(params) scans params["file_paths"] for programmatic callers (thread pool natively; one WSL launch
+#   per ~10k chars of paths); it is not a menu option because the UI only ever passes the one selected file.
 #
 # Normalized Result Schema:
 # {
@@ -57,17 +64,26 @@
 #   ]
 # }
 #
-# - findings are best-effort: the parser highlights common zsteg patterns but the complete raw output is always included.
+# - findings are best-effort: the parser highlights common zsteg patterns over the complete output; raw.stdout is a head/tail view for long scans.
 #
 # Error Handling & Hints:
 # - Missing binary: Clear message + hint to install Ruby and gem install zsteg, or use WSL.
 # - Unsupported/unknown file type: Suggests converting (e.g., JPEG → PNG) before scanning.
-# - Timeouts & non-zero exit: Reported with preserved stdout/stderr.
+# - Timeouts & non-zero exit: Reported with preserved stdout/stderr. Scan 60s / extract 120s per file by default;
+#   params["timeout"] or the ZSTEG_TIMEOUT env var (seconds) override both.
+# - params["include_raw"] = False leaves the raw stdout/stderr out of the HTML and JSON views (findings only).
 # - Extraction write failures: Surfaces write error and keeps the captured byte length in raw.
 #
 # Self-test & Shutdown:
 # - self_test(): Lightweight presence check (always returns True) so the feature loads even if zsteg isn’t installed; Help remains accessible.
-# - shutdown(): No persistent state; logs a message.
+# - shutdown(): Clears the cached runtime detection and scan/channel caches, stops the persistent zsteg worker if one is
+#   running; logs a message.
+#
+# Caching:
+# - Successful scans are cached per (absolute path, mtime, size), up to 64 files (LRU). A repeat Scan, or the channel
+#   suggestions after a failed Extract, reuse the cached result; editing the file changes its key.
+# - Channel suggestions are also memoized by a blake2b digest of the file bytes + size (64 entries), so a run of failed
+#   Extract attempts against one image scans it once, even across copies/renames.
 #
 # Known Limitations:
 # - zsteg focuses on PNG/BMP families; other formats may produce limited/unsupported output.
@@ -81,16 +97,26 @@
 
 from __future__ import annotations
 
+import functools
+import html
+import hashlib
 import json
+import operator
 import os
 import platform
+import queue
 import re
-import shutil
+import shlex
+import stat
 import subprocess
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
-
-from jinja2 import Template
+import tempfile
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from jinja2 import DictLoader, Environment
 from app.core.contracts.feature_interface import BaseFeature
 from app.core.easy_options import EasyOptions
 
@@ -103,11 +129,27 @@ except Exception:
     _simpledialog = None
 
 
+# Optional: orjson serializes in C (with indent); stdlib fallback stays on json's C fast path by skipping indent
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def _dumps(obj) -> str:
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
 # -----------------------------
 # Normalized result structure
 # -----------------------------
 @dataclass
 class ZstegResult:
+    # Spelled out instead of dataclass(slots=True), which needs Python 3.10; the fields have no defaults to clash with
+    __slots__ = ("tool", "ok", "action", "file", "cmd", "findings", "output_files", "errors", "raw", "notes")
+
     tool: str
     ok: bool
     action: str  # "scan" | "extract"
@@ -119,120 +161,501 @@ class ZstegResult:
     raw: Dict[str, str]
     notes: List[str]
 
-    def to_dict(self) -> Dict:
-        return {
-            "tool": self.tool,
-            "ok": self.ok,
-            "action": self.action,
-            "file": self.file,
-            "cmd": self.cmd,
-            "findings": self.findings,
-            "output_files": self.output_files,
-            "errors": self.errors,
-            "raw": self.raw,
-            "notes": self.notes,
-        }
+    def to_dict(self, include_raw: bool = True) -> Dict:
+        """Shallow dict of the fields (one C-level attrgetter call; unlike asdict() it doesn't deep-copy findings/raw)."""
+        d = dict(zip(_RESULT_FIELDS, _get_result_fields(self)))
+        if not include_raw:
+            del d["raw"]
+        return d
+
+    @staticmethod
+    def _error(action: str, file: str, errors: str, notes: List[str], cmd: Sequence[str] = ()) -> ZstegResult:
+        """Failed result with empty findings/output_files/raw fields."""
+        return ZstegResult(
+            tool="zsteg",
+            ok=False,
+            action=action,
+            file=file,
+            cmd=list(cmd),
+            findings=[],
+            output_files=[],
+            errors=errors,
+            raw={"stdout": "", "stderr": ""},
+            notes=notes,
+        )
+
+
+_RESULT_FIELDS = tuple(f.name for f in fields(ZstegResult))
+_get_result_fields = operator.attrgetter(*_RESULT_FIELDS)
 
 
 # -----------------------------
 # Helpers (platform / exec)
 # -----------------------------
-def _is_windows() -> bool:
-    return platform.system() == "Windows"
+# The platform can't change while we run, so decide once at import
+_IS_WINDOWS = platform.system() == "Windows"
+
+
+def _scan_path_for(names: Tuple[str, ...]) -> Dict[str, str]:
+    """
+    Walk PATH once, listing each directory with a single os.scandir(), and return {name: full path} for every name found.
+    Same precedence as shutil.which(): first PATH entry wins; on Windows PATHEXT extensions are tried in order, case-insensitively.
+    Replaces one which() per tool, each of which probes every PATH directory separately.
+    """
+    found: Dict[str, str] = {}
+    exts = [e.lower() for e in os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").split(os.pathsep) if e] if _IS_WINDOWS else [""]
+    for d in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        if len(found) == len(names):
+            break
+        if not d:
+            continue
+        try:
+            with os.scandir(d) as it:
+                entries = {(e.name.lower() if _IS_WINDOWS else e.name): e for e in it}
+        except OSError:
+            continue
+        for name in names:
+            if name in found:
+                continue
+            for ext in exts:
+                e = entries.get(name + ext)
+                try:
+                    if e is not None and e.is_file() and (_IS_WINDOWS or os.access(e.path, os.X_OK)):
+                        found[name] = e.path
+                        break
+                except OSError:
+                    continue
+    return found
+
+
+@functools.lru_cache(maxsize=1)
+def _which_tools() -> Dict[str, str]:
+    """Everything _detect_runtime/_has_file_cmd look up, from one PATH walk. Cached; callers must not mutate."""
+    return _scan_path_for(("zsteg", "wsl", "file", "ruby"))
 
 
 def _has_file_cmd() -> bool:
     """Detect presence of Unix 'file' tool (needed by zsteg unless --no-file)."""
-    return shutil.which("file") is not None
+    return "file" in _which_tools()
 
 
-def _detect_runtime() -> Tuple[str, Optional[List[str]], List[str]]:
+@functools.lru_cache(maxsize=1)
+def _detect_runtime() -> Tuple[str, Optional[Tuple[str, ...]], Tuple[str, ...]]:
     """
+    Cached for the session (PATH rarely changes); cleared in Feature.shutdown(). Returns tuples so the cached value
+    can't be mutated by callers; build commands with list(base_cmd).
     Returns (mode, base_cmd, notes)
     mode: "native" | "wsl" | "unix" | "missing"
-    base_cmd: list like ["zsteg"] or ["wsl", "-e", "zsteg"]
+    base_cmd: tuple like ("zsteg",) or ("wsl", "-e", "zsteg")
     """
     notes: List[str] = []
-    if _is_windows():
-        exe = shutil.which("zsteg")
+    if _IS_WINDOWS:
+        exe = _which_tools().get("zsteg")
         if exe:
             # If native zsteg is present but no 'file', we can still run with --no-file
             if not _has_file_cmd():
                 notes.append("Native zsteg without 'file' detected; will use --no-file.")
-            return "native", [exe], notes
-        if shutil.which("wsl"):
+            return "native", (exe,), tuple(notes)
+        if "wsl" in _which_tools():
             notes.append("Using WSL fallback for zsteg (Ruby gem).")
-            return "wsl", ["wsl", "-e", "zsteg"], notes
+            return "wsl", ("wsl", "-e", "zsteg"), tuple(notes)
         notes.append("zsteg not found on PATH and WSL not available.")
         notes.append("Hint: zsteg is a Ruby gem. Install Ruby then `gem install zsteg`.")
-        return "missing", None, notes
+        return "missing", None, tuple(notes)
     else:
-        exe = shutil.which("zsteg")
+        exe = _which_tools().get("zsteg")
         if exe:
-            return "unix", [exe], notes
+            return "unix", (exe,), tuple(notes)
         notes.append("zsteg not found on PATH.")
         notes.append("Hint: zsteg is a Ruby gem. Install Ruby then `gem install zsteg`.")
-        return "missing", None, notes
+        return "missing", None, tuple(notes)
 
 
+@functools.lru_cache(maxsize=512)
 def _to_wsl_path(win_path: str) -> str:
+    # Fast path for the usual "C:\\..." form: slice the drive letter instead of splitdrive + two replace passes
+    if len(win_path) >= 2 and win_path[1] == ":":
+        rest = win_path[2:].replace("\\", "/")
+        return f"/mnt/{win_path[0].lower()}{rest}"
     drive, rest = os.path.splitdrive(win_path)
     drive_letter = drive.replace(":", "").lower()
     path = rest.replace("\\", "/")
     return f"/mnt/{drive_letter}{path}"
 
 
-def _maybe_wsl_path(mode: str, p: str) -> str:
-    if mode == "wsl" and _is_windows():
-        return _to_wsl_path(os.path.abspath(p))
-    return p
+# Specialized at import: off Windows there is never a path to translate
+if _IS_WINDOWS:
+    def _maybe_wsl_path(mode: str, p: str) -> str:
+        if mode == "wsl":
+            # Absolutize first so the memoized translation is keyed on one canonical form per file
+            return _to_wsl_path(os.path.abspath(p))
+        return p
+else:
+    def _maybe_wsl_path(mode: str, p: str) -> str:
+        return p
+
+
+# Default per-file timeouts (seconds); zsteg normally answers in about a second, so a stall is cut off sooner on scans
+_SCAN_TIMEOUT = 60
+_EXTRACT_TIMEOUT = 120
+
+
+def _include_raw(params: Optional[dict]) -> bool:
+    """
+    Views show the raw output unless params["include_raw"] is false; skipping it saves escaping/serializing up to 64 KB
+    per result when only the findings are wanted. The result object itself is unchanged (it may be shared via the scan cache).
+    """
+    return bool((params or {}).get("include_raw", True))
+
+
+def _timeout(params: Optional[dict], default: int) -> int:
+    """
+    Timeout for one action: params["timeout"], else the ZSTEG_TIMEOUT env var, else default. Non-positive or
+    non-numeric values are ignored.
+    """
+    for raw in ((params or {}).get("timeout"), os.environ.get("ZSTEG_TIMEOUT")):
+        try:
+            value = int(raw)
+        except (TypeError, ValueError):
+            continue
+        if value > 0:
+            return value
+    return default
+
+
+# Spawn settings: CPython only uses posix_spawn() when close_fds is False, cwd is None and no preexec_fn, pass_fds
+# or start_new_session is given; keep it that way. Every argument we pass is an absolute path, so callers leave cwd
+# unset, and descriptors Python opens are non-inheritable (PEP 446), so close_fds=False doesn't leak them to zsteg.
+# Windows has no posix_spawn path and keeps close_fds=True.
+_CLOSE_FDS = _IS_WINDOWS
 
 
 def _run(cmd: List[str], cwd: Optional[str] = None, timeout: int = 90, text: bool = True) -> subprocess.CompletedProcess:
-    return subprocess.run(
+    """
+    Run cmd to completion and capture both streams. They go to unnamed temp files rather than pipes, so a large
+    `zsteg -a` (or WSL batch) output is written straight to the page cache instead of being drained 32 KB at a time.
+    """
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        proc = subprocess.run(
+            cmd,
+            stdout=out,
+            stderr=err,
+            timeout=timeout,
+            cwd=cwd,
+            stdin=subprocess.DEVNULL,
+            shell=False,
+            close_fds=_CLOSE_FDS,
+        )
+        out.seek(0)
+        err.seek(0)
+        stdout, stderr = out.read(), err.read()
+    if text:
+        stdout, stderr = _decode(stdout), _decode(stderr)
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+def _decode(data: bytes) -> str:
+    # Same result as text=True for zsteg's UTF-8 output, minus the UnicodeDecodeError on stray bytes
+    return data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _run_to_file(cmd: List[str], out, cwd: Optional[str] = None, timeout: int = 90) -> Tuple[int, bytes]:
+    """
+    Run cmd with stdout attached directly to the open binary file `out`, so the payload goes from the child to disk
+    without passing through Python memory. Returns (returncode, stderr_bytes); the child is killed on timeout.
+    """
+    proc = subprocess.Popen(
         cmd,
-        capture_output=True,
-        text=text,
-        timeout=timeout,
+        stdout=out,
+        stderr=subprocess.PIPE,
+        stdin=subprocess.DEVNULL,
         cwd=cwd,
+        shell=False,
+        close_fds=_CLOSE_FDS,
+    )
+    try:
+        _, err = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    return proc.returncode, err or b""
+
+
+# Scans keep at most this much stdout in memory for the raw panel; past it only a rolling tail is kept
+_RAW_KEEP_CHARS = 5 * 1024 * 1024
+# Read buffer for streamed zsteg output
+_PIPE_BUFSIZE = 64 * 1024
+
+
+def _run_streaming(cmd: List[str], cwd: Optional[str] = None, timeout: int = 90) -> Tuple[int, str, str, List[Dict[str, str]], int]:
+    """
+    Run a text-producing zsteg command and parse findings line by line as output arrives,
+    instead of buffering the whole of stdout first.
+    Returns (returncode, kept_stdout, stderr, findings, dropped_chars). Past _RAW_KEEP_CHARS only the last
+    ~_RAW_VIEW_CHARS of stdout are kept (so the raw view's tail is the real end of the output); dropped_chars counts
+    what was discarded in between. Raises subprocess.TimeoutExpired like _run(), with the partial stdout/stderr attached.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         stdin=subprocess.DEVNULL,
+        encoding="utf-8",
+        errors="replace",  # decoded by the C io layer; the locale codec (e.g. cp1252) would raise on stray bytes mid-scan
+        bufsize=_PIPE_BUFSIZE,  # lines are parsed, not shown live, so read the pipe in big blocks (bufsize=1 meant 8 KB reads)
+        cwd=cwd,
         shell=False,
+        close_fds=_CLOSE_FDS,
     )
+    # Drain stderr on the side so a chatty backtrace can't block stdout
+    err_chunks: List[str] = []
+    err_thread = threading.Thread(target=lambda: err_chunks.append(proc.stderr.read()), daemon=True)
+    err_thread.start()
+    expired = threading.Event()
+
+    def _expire() -> None:
+        expired.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, _expire)
+    timer.start()
+
+    findings: List[Dict[str, str]] = []
+    kept: List[str] = []
+    kept_len = 0
+    tail: Deque[str] = deque()
+    tail_len = 0
+    dropped = 0
+    try:
+        for line in proc.stdout:
+            f = _parse_finding_line(line.rstrip("\r\n"))
+            if f:
+                findings.append(f)
+            if kept_len < _RAW_KEEP_CHARS:
+                kept.append(line)
+                kept_len += len(line)
+                continue
+            tail.append(line)
+            tail_len += len(line)
+            while tail_len > _RAW_VIEW_CHARS and len(tail) > 1:
+                old = tail.popleft()
+                tail_len -= len(old)
+                dropped += len(old)
+        proc.wait()
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        err_thread.join()
+        proc.stdout.close()
+        proc.stderr.close()
+
+    if dropped:
+        kept.append(f"\n... [{dropped} characters not kept] ...\n")
+    kept.extend(tail)
+    if expired.is_set():
+        # Carry what zsteg printed before it was killed so the caller can still show those hits
+        raise subprocess.TimeoutExpired(cmd, timeout, output="".join(kept), stderr="".join(err_chunks))
+    return proc.returncode, "".join(kept), "".join(err_chunks), findings, dropped
+
+
+# Opt-in: keep one Ruby process with the zsteg gem loaded and send it every scan, instead of paying Ruby + gem
+# start-up (often most of a scan's wall time) per file. Off by default because it leaves a background process
+# running until shutdown(), and scans through it run one at a time.
+_PERSISTENT_ENABLED = os.environ.get("ZSTEG_PERSISTENT", "").lower() in ("1", "true", "yes")
+_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "zsteg_worker.rb")
+
+
+class _WorkerRetired(Exception):
+    """
+    The worker was killed after another request timed out; the caller should start a fresh one.
+    """
+
+
+class _ZstegWorker:
+    """
+    Long-lived `ruby zsteg_worker.rb`. Each request is one JSON array of zsteg arguments; each reply is
+      "<rc> <stdout bytes> <stderr bytes>\n" + stdout + stderr
+    """
+
+    def __init__(self, argv: List[str]):
+        self.proc = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            close_fds=_CLOSE_FDS,
+        )
+        self._replies: "queue.Queue[Optional[Tuple[int, bytes, bytes]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._retired = False
+        # Windows pipes can't be select()ed, so a reader thread hands complete replies to run_cmd with a timeout
+        threading.Thread(target=self._pump, daemon=True).start()
+
+    def _pump(self) -> None:
+        out = self.proc.stdout
+        try:
+            while True:
+                header = out.readline()
+                if not header:
+                    break
+                rc, n_out, n_err = (int(x) for x in header.split())
+                self._replies.put((rc, out.read(n_out), out.read(n_err)))
+        except (OSError, ValueError):
+            pass
+        self._replies.put(None)
+
+    def run_cmd(self, args: List[str], timeout: int) -> Tuple[int, bytes, bytes]:
+        with self._lock:
+            if self._retired:
+                raise _WorkerRetired()
+            try:
+                self.proc.stdin.write(json.dumps(args).encode("utf-8") + b"\n")
+                self.proc.stdin.flush()
+            except OSError:
+                raise RuntimeError("zsteg worker is not accepting requests")
+            try:
+                reply = self._replies.get(timeout=timeout)
+            except queue.Empty:
+                # Retire before releasing the lock: a late reply to this request must never be read as the
+                # next caller's answer, and the next caller must not mistake the dying worker for a broken gem
+                self._retired = True
+                self.proc.kill()
+                raise subprocess.TimeoutExpired(args, timeout)
+            if reply is None:
+                raise RuntimeError("zsteg worker exited; is the zsteg gem loadable by this ruby?")
+            return reply
+
+    def alive(self) -> bool:
+        return not self._retired and self.proc.poll() is None
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except Exception:
+            self.proc.kill()
+
+
+_worker: Optional[_ZstegWorker] = None
+_worker_failed = False  # set once the worker can't run; later scans go straight to zsteg until shutdown()
+_WORKER_LOCK = threading.Lock()
+
+
+def _worker_argv(mode: str) -> Optional[List[str]]:
+    if mode == "wsl":
+        return ["wsl", "-e", "ruby", _to_wsl_path(_WORKER_SCRIPT)]
+    ruby = _which_tools().get("ruby")
+    return [ruby, _WORKER_SCRIPT] if ruby else None
+
+
+def _use_worker() -> bool:
+    return _PERSISTENT_ENABLED and not _worker_failed
+
+
+def _run_worker(mode: str, args: List[str], timeout: int) -> Tuple[int, str, str]:
+    """
+    Run `zsteg <args>` through the shared worker, starting it on first use. Returns (returncode, stdout, stderr).
+    A timed-out worker is killed and respawned next time; one that can't start or dies raises RuntimeError
+    and disables the worker so callers fall back to launching zsteg directly.
+    """
+    global _worker, _worker_failed
+    while True:
+        with _WORKER_LOCK:
+            if _worker is None or not _worker.alive():
+                argv = _worker_argv(mode)
+                if argv is None:
+                    _worker_failed = True
+                    raise RuntimeError("ruby not found on PATH")
+                _worker = _ZstegWorker(argv)
+            worker = _worker
+        try:
+            rc, out, err = worker.run_cmd(args, timeout)
+            break
+        except _WorkerRetired:
+            # Another request timed out and killed this worker while we waited for it
+            continue
+        except subprocess.TimeoutExpired:
+            with _WORKER_LOCK:
+                if _worker is worker:
+                    _worker = None
+            raise
+        except RuntimeError:
+            worker.proc.kill()
+            with _WORKER_LOCK:
+                _worker_failed = True
+                if _worker is worker:
+                    _worker = None
+            raise
+    return rc, _decode(out), _decode(err)
+
+
+def _close_worker() -> None:
+    global _worker, _worker_failed
+    with _WORKER_LOCK:
+        if _worker is not None:
+            _worker.close()
+            _worker = None
+        _worker_failed = False
 
 
 # -----------------------------
 # Parsers / prompts / errors
 # -----------------------------
+# Compiled once at import instead of going through re's pattern cache on every line.
+# One alternation per line, tried in priority order; [^\r\n] keeps every match inside a single line:
+#   "b1,r,lsb,xy .. text: 'FLAG{..}'"  -> channel + desc
+#   "b1,r,msb,xy: something"           -> channel + desc (the channel must contain a comma)
+#   any other line with a hint word    -> whole line as desc
+_RE_FINDING = re.compile(
+    r"(?:^|(?<=\r))[ \t]*(?:"
+    r"(?P<chan>[a-z0-9_,]+)[ \t]+\.\.[ \t]+(?P<desc>[^\r\n]+)"
+    r"|(?P<chan2>[a-z0-9_]*,[a-z0-9_,]*)[ \t]*:[ \t]*(?P<desc2>[^\r\n]+)"
+    r"|(?P<hint>[^\r\n]*?(?:png|text:|ascii|utf|zlib|string|gzip|bzip|pcx)[^\r\n]*)"
+    r")",
+    re.IGNORECASE | re.MULTILINE,
+)
+_RE_RUBY_NOISE = re.compile(r"(ruby[/\\]gems|\bzsteg[/\\].*\.rb:|\bopen3\.rb:|lib[/\\]ruby)", re.IGNORECASE)
+_RE_ANSI = re.compile(r"\x1b\[[0-9;?]*[a-zA-Z]")  # colour/cursor escapes (zsteg and Ruby colourize when they think it's a tty)
+
+
 def _parse_findings(stdout: str) -> List[Dict[str, str]]:
     """
     Best-effort parser to surface likely interesting lines from zsteg -a output.
     """
-    findings: List[Dict[str, str]] = []
-    for line in stdout.splitlines():
-        # "b1,r,lsb,xy .. text: 'FLAG{..}'"
-        m = re.match(r"\s*([a-z0-9_,]+)\s+\.\.\s+(.*)$", line, re.IGNORECASE)
-        if m:
-            findings.append({"channel": m.group(1), "desc": m.group(2)})
-            continue
-        # "b1,r,msb,xy: something"
-        m = re.match(r"\s*([a-z0-9_,]+)\s*:\s*(.+)$", line, re.IGNORECASE)
-        if m and "," in m.group(1):
-            findings.append({"channel": m.group(1), "desc": m.group(2)})
-            continue
-        # Generic interesting hints
-        if any(key in line.lower() for key in ("text:", "utf", "ascii", "zlib", "bzip", "gzip", "png", "pcx", "string")):
-            findings.append({"channel": "", "desc": line.strip()})
-    return findings
+    # A single finditer over the whole buffer: the regex engine skips non-matching lines itself
+    # instead of Python splitting the text and trying each pattern line by line
+    return [_finding(m) for m in _RE_FINDING.finditer(stdout)]
+
+
+def _parse_finding_line(line: str) -> Optional[Dict[str, str]]:
+    # Used by the streaming reader, which already has the output split into lines
+    m = _RE_FINDING.match(line)
+    return _finding(m) if m else None
+
+
+def _finding(m: "re.Match[str]") -> Dict[str, str]:
+    if m["chan"] is not None:
+        return {"channel": m["chan"], "desc": m["desc"]}
+    if m["chan2"] is not None:
+        return {"channel": m["chan2"], "desc": m["desc2"]}
+    return {"channel": "", "desc": m["hint"].strip()}
 
 
 def _prompt(title: str, prompt: str) -> str:
     if _tk is None or _simpledialog is None:
         return ""
     try:
+        # Created and destroyed on the calling thread: pywebview runs each API call on a fresh thread,
+        # and a Tk root must never outlive (or be torn down from outside) the thread that made it
         root = _tk.Tk()
         root.withdraw()
-        val = _simpledialog.askstring(title, prompt)
-        root.destroy()
+        try:
+            val = _simpledialog.askstring(title, prompt, parent=root)
+        finally:
+            root.destroy()
         return val or ""
     except Exception:
         return ""
@@ -240,69 +663,148 @@ def _prompt(title: str, prompt: str) -> str:
 
 def _sanitize_stderr(err: str, limit_lines: int = 10, limit_chars: int = 800) -> str:
     """
-    Strip Ruby backtrace noise and trim size so users don't see scary internals.
+    Strip Ruby backtrace noise and ANSI colour codes, and trim size so users don't see scary internals.
     """
     if not err:
         return ""
-    lines = []
-    for ln in err.splitlines():
+    # Walk the text with find() rather than splitlines() so a long backtrace is never copied whole,
+    # and stop once enough lines/characters are kept; the final cut below then only touches a short string.
+    lines: List[str] = []
+    used = 0
+    start, end_all = 0, len(err)
+    while start < end_all and len(lines) < limit_lines and used <= limit_chars:
+        end = err.find("\n", start)
+        if end < 0:
+            end = end_all
+        ln = _RE_ANSI.sub("", err[start:end]).rstrip("\r")
+        start = end + 1
         # Drop stack frames & noisy "from ..." lines
-        if re.search(r"(ruby[/\\]gems|\bzsteg[/\\].*\.rb:|\bopen3\.rb:|lib[/\\]ruby)", ln, re.IGNORECASE):
+        if _RE_RUBY_NOISE.search(ln):
             continue
         if ln.strip().startswith("from "):
             continue
         lines.append(ln)
-        if len(lines) >= limit_lines:
-            break
+        used += len(ln) + 1
     msg = "\n".join(lines).strip()
     if len(msg) > limit_chars:
         msg = msg[:limit_chars] + "…"
     return msg
 
 
-def _suggest_channels(file_path: str, mode: str, base_cmd: List[str]) -> List[str]:
+# Channel suggestions keyed by (blake2b digest of the file bytes, size): `zsteg -a` output depends only on the
+# content, so renamed copies and touched files that miss the stat-keyed scan cache still don't re-scan.
+_CHANNEL_CACHE: OrderedDict[Tuple[bytes, int], List[str]] = OrderedDict()
+_CHANNEL_CACHE_MAX = 64
+_CHANNEL_CACHE_LOCK = threading.Lock()  # Extract runs on pywebview's per-call threads, like _SCAN_CACHE's pool threads
+
+
+def _content_key(file_path: str, size: int) -> Optional[Tuple[bytes, int]]:
+    # The whole file is hashed (in 64KB reads): two images can share their first blocks and still differ in LSBs further on
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(64 * 1024), b""):
+                h.update(block)
+    except OSError:
+        return None
+    return h.digest(), size
+
+
+def _suggest_channels(file_path: str, mode: str, base_cmd: Sequence[str], detect_notes: Sequence[str] = ()) -> List[str]:
     """
-    Run a quick zsteg -a to collect plausible channel tokens.
+    Run a quick zsteg -a to collect plausible channel tokens (memoized by file content; reuses a cached scan when available).
     """
-    file_arg = _maybe_wsl_path(mode, file_path)
+    abs_path = os.path.abspath(file_path)
+    st = _stat_file(abs_path)
+    key = _cache_key(abs_path, st)
+    res = _cache_get(key)
+    # The stat-keyed scan cache is free to check; only hash the whole file when it misses
+    content_key = _content_key(abs_path, st.st_size) if st and res is None else None
+    if content_key is not None:
+        with _CHANNEL_CACHE_LOCK:
+            cached = _CHANNEL_CACHE.get(content_key)
+            if cached is not None:
+                _CHANNEL_CACHE.move_to_end(content_key)
+                return list(cached)
+
+    file_arg = _maybe_wsl_path(mode, abs_path)
     cmd = list(base_cmd)
     # Inject --no-file if native Windows without 'file'
-    if _is_windows() and mode == "native" and not _has_file_cmd():
+    if _IS_WINDOWS and mode == "native" and not _has_file_cmd():
         cmd += ["--no-file"]
     cmd += ["-a", file_arg]
     try:
-        proc = _run(cmd, cwd=os.path.dirname(file_path), timeout=60, text=True)
+        if res is None:
+            proc = _run(cmd, timeout=60, text=True)
+            # Cached for later Scans too, so carry the same runtime notes _run_scan would
+            res = _scan_result(file_path, cmd, proc.returncode, proc.stdout, proc.stderr, list(detect_notes))
+            _cache_put(key, res)
         chans: List[str] = []
-        for f in _parse_findings(proc.stdout):
+        for f in res.findings:
             ch = f.get("channel", "").strip()
             if ch and ch not in chans:
                 chans.append(ch)
             if len(chans) >= 8:
                 break
-        return chans
+        if content_key is not None and res.ok:
+            with _CHANNEL_CACHE_LOCK:
+                _CHANNEL_CACHE[content_key] = chans
+                _CHANNEL_CACHE.move_to_end(content_key)
+                while len(_CHANNEL_CACHE) > _CHANNEL_CACHE_MAX:
+                    _CHANNEL_CACHE.popitem(last=False)
+        return list(chans)
     except Exception:
         return []
 
 
-def _friendly_error(stderr: str, stdout: str, file_path: str, mode: str, base_cmd: List[str], attempted_channel: str = "") -> Tuple[str, List[str]]:
+# Known zsteg/Ruby failure messages; the group name says which one matched
+_ERR_HINT_RE = re.compile(
+    r"(?P<no_file>no such file or directory - file -n -b -f -)"
+    r"|(?P<bad_channel>color_extractor|undefined method `size' for nil)"
+    r"|(?P<unsupported>unknown file type|not supported)"
+    r"|(?P<not_found>command not found)",
+    re.IGNORECASE,
+)
+
+
+# Stand-alone copy of the "unsupported" alternative: scan stdout can be megabytes, and .search() stops at the
+# first hit where _scan_errors()' finditer would walk the whole text
+_RE_UNKNOWN = re.compile(r"unknown file type|not supported", re.IGNORECASE)
+
+
+def _scan_errors(*texts: str) -> Set[str]:
+    """
+    One case-insensitive regex pass per stream, instead of lowering a concatenated copy. Returns the matched group names.
+    """
+    return {m.lastgroup for text in texts if text for m in _ERR_HINT_RE.finditer(text)}
+
+
+def _friendly_error(
+    stderr: str,
+    stdout: str,
+    file_path: str,
+    mode: str,
+    base_cmd: Sequence[str],
+    attempted_channel: str = "",
+    detect_notes: Sequence[str] = (),
+) -> Tuple[str, List[str]]:
     """
     Convert raw Ruby errors into a concise, actionable message.
     Returns (friendly_message, extra_notes)
     """
-    s = (stderr or "") + "\n" + (stdout or "")
-    s_low = s.lower()
+    found = _scan_errors(stderr, stdout)
 
     # Missing external 'file' (native Windows without MSYS2/WSL)
-    if "no such file or directory - file -n -b -f -" in s_low:
+    if "no_file" in found:
         return (
             "zsteg couldn't call the external 'file' tool. Either install MSYS2 'file' or run with --no-file.",
             ["MSYS2 tip: install 'file' and add C:\\msys64\\usr\\bin to PATH.", "This module auto-adds --no-file on Windows when 'file' is missing."]
         )
 
     # Invalid/unsupported channel → ColorExtractor nil error
-    if "color_extractor" in s_low or "undefined method `size' for nil" in s_low:
+    if "bad_channel" in found:
         notes = ["The channel you provided isn't valid for this image. Use a channel reported by 'zsteg -a'."]
-        chans = _suggest_channels(file_path, mode, base_cmd)
+        chans = _suggest_channels(file_path, mode, base_cmd, detect_notes)
         if chans:
             notes.append("Suggested channels: " + ", ".join(chans[:5]))
         if attempted_channel:
@@ -310,7 +812,7 @@ def _friendly_error(stderr: str, stdout: str, file_path: str, mode: str, base_cm
         return ("Invalid channel for this image. Pick one from a scan and try again.", notes)
 
     # Generic not supported / unknown file type
-    if "unknown file type" in s_low or "not supported" in s_low:
+    if "unsupported" in found:
         return (
             "This format may not be supported by zsteg. Convert to PNG/BMP and retry.",
             ["Example: convert input.jpg output.png"]
@@ -320,7 +822,185 @@ def _friendly_error(stderr: str, stdout: str, file_path: str, mode: str, base_cm
     return (_sanitize_stderr(stderr) or "Extraction failed.", [])
 
 
-_HTML_TEMPLATE = Template(
+# Raw scan output shown in HTML/JSON: head and tail this long; findings are always parsed from the full output
+_RAW_VIEW_CHARS = 32 * 1024
+
+
+def _truncate(text: str, n: int = _RAW_VIEW_CHARS) -> str:
+    """
+    Keep the first and last n characters of a long output with a marker in between, so rendering and JSON
+    serialization cost stay bounded however much zsteg printed.
+    """
+    if len(text) <= 2 * n:
+        return text
+    return text[:n] + f"\n... [{len(text) - 2 * n} characters elided] ...\n" + text[-n:]
+
+
+def _scan_result(
+    file_path: str,
+    cmd: List[str],
+    returncode: int,
+    stdout: str,
+    stderr: str,
+    notes: List[str],
+    findings: Optional[List[Dict[str, str]]] = None,
+) -> ZstegResult:
+    """
+    Build the normalized result for one `zsteg -a` run (shared by single and batch scans).
+    Pass findings when they were already parsed while streaming; otherwise stdout is parsed here.
+    """
+    ok = returncode == 0
+
+    # Friendly errors / notes
+    err_found = _scan_errors(stderr)
+    if "not_found" in err_found:
+        notes.append("zsteg not installed. Install Ruby and `gem install zsteg`.")
+    if "unsupported" in err_found or (stdout and _RE_UNKNOWN.search(stdout)):
+        notes.append("Input may not be PNG/BMP; consider converting (e.g., `convert input.jpg output.png`).")
+
+    if findings is None:
+        findings = _parse_findings(stdout)
+    clean_err = _sanitize_stderr(stderr)
+
+    return ZstegResult(
+        tool="zsteg",
+        ok=ok,
+        action="scan",
+        file=file_path,
+        cmd=cmd,
+        findings=findings,
+        output_files=[],
+        errors=None if ok else (clean_err or "Non-zero exit status"),
+        raw={"stdout": _truncate(stdout), "stderr": clean_err},
+        notes=notes,
+    )
+
+
+# -----------------------------
+# Scan cache
+# -----------------------------
+# Successful scans keyed by (abspath, st_mtime_ns, st_size), so Scan followed by Extract (which re-scans for
+# channel suggestions on failure) doesn't run `zsteg -a` twice on an unchanged file. Cleared in Feature.shutdown().
+_SCAN_CACHE: OrderedDict[Tuple[str, int, int], ZstegResult] = OrderedDict()
+_SCAN_CACHE_MAX = 64
+
+
+def _stat_file(file_path: str) -> Optional[os.stat_result]:
+    """
+    One stat per action: returns the stat result for a regular file (None otherwise); it doubles as the cache key source.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def _cache_key(abs_path: str, st: Optional[os.stat_result]) -> Optional[Tuple[str, int, int]]:
+    if st is None:
+        return None
+    return abs_path, st.st_mtime_ns, st.st_size
+
+
+_SCAN_CACHE_LOCK = threading.Lock()  # batch scans hit the cache from pool threads
+
+
+def _cache_get(key: Optional[Tuple[str, int, int]]) -> Optional[ZstegResult]:
+    if key is None:
+        return None
+    with _SCAN_CACHE_LOCK:
+        res = _SCAN_CACHE.get(key)
+        if res is not None:
+            _SCAN_CACHE.move_to_end(key)
+        return res
+
+
+def _cache_put(key: Optional[Tuple[str, int, int]], res: ZstegResult) -> None:
+    if key is None or not res.ok:
+        return
+    with _SCAN_CACHE_LOCK:
+        _SCAN_CACHE[key] = res
+        _SCAN_CACHE.move_to_end(key)
+        while len(_SCAN_CACHE) > _SCAN_CACHE_MAX:
+            _SCAN_CACHE.popitem(last=False)
+
+
+# -----------------------------
+# Batch execution
+# -----------------------------
+# After each file the loop prints "\n<marker> <exit code>\n" on stdout and "\n<marker>\n" on stderr.
+# The leading newline keeps output without a trailing newline from swallowing the marker; the regex consumes it again.
+_BATCH_MARK = "---FILE:"
+_BATCH_MARK_RE = re.compile(re.escape("\n" + _BATCH_MARK) + r" (\d+)\n")
+# Keep each `bash -c` script well under the Windows command-line limit
+_BATCH_MAX_CMD = 10000
+
+
+def _batch_chunks(file_args: List[str], budget: int) -> List[List[str]]:
+    """
+    Group file args so the quoted list in each chunk stays within budget characters.
+    """
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+    for arg in file_args:
+        size = len(shlex.quote(arg)) + 1
+        if current and used + size > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(arg)
+        used += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _batch_script(argv: List[str], file_args: List[str]) -> str:
+    files = " ".join(shlex.quote(f) for f in file_args)
+    return (
+        f"for f in {files}; do {shlex.join(argv)} \"$f\"; rc=$?; "
+        f"printf '\\n%s %s\\n' {shlex.quote(_BATCH_MARK)} \"$rc\"; printf '\\n%s\\n' {shlex.quote(_BATCH_MARK)} >&2; done"
+    )
+
+
+def _run_batch_wsl(
+    base_cmd: Sequence[str], file_args: List[str], args: List[str], timeout: int
+) -> Tuple[List[Optional[subprocess.CompletedProcess]], str]:
+    """
+    Run `<base_cmd> <args> <file>` for every file arg; returns one CompletedProcess per file (None if never reached)
+    and the reason the unreached files were not scanned.
+    Runs one `wsl -e bash -c` loop per chunk so wsl.exe starts once per ~10k chars of arguments.
+    A timeout or error stops the batch there; results of the chunks that already finished are kept.
+    """
+    argv = [*base_cmd[2:], *args]  # ["wsl", "-e", "zsteg"] -> ["zsteg", ...]
+    results: List[Optional[subprocess.CompletedProcess]] = []
+    error = "Batch run ended before this file was processed."
+    for chunk in _batch_chunks(file_args, _BATCH_MAX_CMD - len(_batch_script(argv, []))):
+        script = _batch_script(argv, chunk)
+        try:
+            proc = _run(["wsl", "-e", "bash", "-c", script], timeout=timeout * len(chunk), text=True)
+        except subprocess.TimeoutExpired:
+            error = "Timeout while running zsteg batch scan."
+            break
+        except Exception as e:
+            error = f"Error running zsteg batch scan: {e}"
+            break
+
+        # ["out0", "rc0", "out1", "rc1", ..., trailing]
+        pieces = _BATCH_MARK_RE.split(proc.stdout or "")
+        outs, codes = pieces[0:-1:2], pieces[1::2]
+        errs = (proc.stderr or "").split("\n" + _BATCH_MARK + "\n")
+        for i, file_arg in enumerate(chunk):
+            if i >= len(codes):
+                results.append(None)
+                continue
+            cmd = [*base_cmd, *args, file_arg]
+            results.append(subprocess.CompletedProcess(cmd, int(codes[i]), outs[i], errs[i] if i < len(errs) else ""))
+    results.extend([None] * (len(file_args) - len(results)))
+    return results, error
+
+
+_HTML_SOURCE = (
     """
 <div class="panel">
   <h2>Zsteg – {{ result.action|capitalize }} ({{ "OK" if result.ok else "Failed" }})</h2>
@@ -373,6 +1053,7 @@ _HTML_TEMPLATE = Template(
     </div>
   {% endif %}
 
+  {% if include_raw %}
   <details>
     <summary>Raw Output (sanitized)</summary>
     <pre>{{ result.raw.stdout }}</pre>
@@ -380,11 +1061,12 @@ _HTML_TEMPLATE = Template(
     <pre style="color:#c00">{{ result.raw.stderr }}</pre>
     {% endif %}
   </details>
+  {% endif %}
 </div>
 """
 )
 
-_HELP_HTML = Template(
+_HELP_SOURCE = (
     """
 <div class="panel">
   <h2>Zsteg – Help</h2>
@@ -394,26 +1076,49 @@ _HELP_HTML = Template(
     <li><b>Extract</b> runs <code>zsteg -E &lt;channel&gt; &lt;file&gt;</code> and saves the bytes to disk.</li>
     <li>If your input isn’t PNG/BMP, consider converting first (e.g., <code>convert input.jpg output.png</code>).</li>
     <li>Windows without native 'file' automatically uses <code>--no-file</code>.</li>
+    <li>Timeouts: 60s per scanned file, 120s per extraction; override with <code>params["timeout"]</code> or the <code>ZSTEG_TIMEOUT</code> environment variable (seconds).</li>
     <li>Install tip: <code>gem install zsteg</code></li>
   </ul>
 </div>
 """
 )
 
+# Compiled once into one Environment (no reload checks, unbounded cache); results are rendered straight from
+# the dataclass via attribute access instead of building a dict per render. Autoescape: raw tool output and
+# findings come from untrusted files and end up in the webview's DOM.
+_TEMPLATES = Environment(
+    autoescape=True,
+    # Drop the indentation/newlines around {% %} tags from the output, so each panel sent to the webview is smaller
+    trim_blocks=True,
+    lstrip_blocks=True,
+    loader=DictLoader({"zsteg_result": _HTML_SOURCE, "zsteg_help": _HELP_SOURCE}),
+    auto_reload=False,
+    cache_size=-1,
+)
+_HTML_TEMPLATE = _TEMPLATES.get_template("zsteg_result")
+_HELP_HTML = _TEMPLATES.get_template("zsteg_help")
+
 
 # =============================
 # Feature Implementation
 # =============================
+# EasyOptions menu in display order: (option id, label, Feature method name)
+_OPTIONS = (
+    ("help", "Help / Tips", "option_help"),
+    ("scan_html", "Scan (HTML)", "option_scan_html"),
+    ("extract_html", "Extract (HTML)", "option_extract_html"),
+    # Developer-friendly JSON outputs
+    ("scan_json", "Scan (JSON)", "option_scan_json"),
+    ("extract_json", "Extract (JSON)", "option_extract_json"),
+)
+
+
 def register():
     instance = Feature()
 
     easy = EasyOptions("Zsteg – Choose an action:")
-    easy.add_option("help", "Help / Tips", instance.option_help)
-    easy.add_option("scan_html", "Scan (HTML)", instance.option_scan_html)
-    easy.add_option("extract_html", "Extract (HTML)", instance.option_extract_html)
-    # Developer-friendly JSON outputs
-    easy.add_option("scan_json", "Scan (JSON)", instance.option_scan_json)
-    easy.add_option("extract_json", "Extract (JSON)", instance.option_extract_json)
+    for option_id, label, method in _OPTIONS:
+        easy.add_option(option_id, label, getattr(instance, method))
 
     return {
         "instance": instance,
@@ -436,6 +1141,13 @@ class Feature(BaseFeature):
         return True
 
     def shutdown(self) -> None:
+        _detect_runtime.cache_clear()
+        _which_tools.cache_clear()
+        with _SCAN_CACHE_LOCK:
+            _SCAN_CACHE.clear()
+        with _CHANNEL_CACHE_LOCK:
+            _CHANNEL_CACHE.clear()
+        _close_worker()
         print("[zsteg] Shutdown called.")
 
     #
@@ -446,118 +1158,147 @@ class Feature(BaseFeature):
 
     def option_scan_html(self, params: dict) -> str:
         res = self._run_scan(params)
-        return _HTML_TEMPLATE.render(result=res.to_dict())
+        return _HTML_TEMPLATE.render(result=res, include_raw=_include_raw(params))
 
     def option_extract_html(self, params: dict) -> str:
         res = self._run_extract(params)
-        return _HTML_TEMPLATE.render(result=res.to_dict())
+        return _HTML_TEMPLATE.render(result=res, include_raw=_include_raw(params))
 
     def option_scan_json(self, params: dict) -> str:
         res = self._run_scan(params)
-        return "<pre>" + json.dumps(res.to_dict(), indent=2) + "</pre>"
+        return "<pre>" + html.escape(_dumps(res.to_dict(_include_raw(params))), quote=False) + "</pre>"
 
     def option_extract_json(self, params: dict) -> str:
         res = self._run_extract(params)
-        return "<pre>" + json.dumps(res.to_dict(), indent=2) + "</pre>"
+        return "<pre>" + html.escape(_dumps(res.to_dict(_include_raw(params))), quote=False) + "</pre>"
 
     #
     # Core actions
     #
-    def _run_scan(self, params: dict) -> ZstegResult:
+    def _run_scan(self, params: dict, st: Optional[os.stat_result] = None) -> ZstegResult:
+        """
+        Scan one file. Pass st when the caller already stat'ed it (batch validation) so it isn't stat'ed twice.
+        """
         file_path = (params or {}).get("file_path") or ""
         notes: List[str] = []
 
-        if not file_path or not os.path.isfile(file_path):
-            return ZstegResult(
-                tool="zsteg",
-                ok=False,
-                action="scan",
-                file=file_path,
-                cmd=[],
-                findings=[],
-                output_files=[],
-                errors="No file selected or invalid path.",
-                raw={"stdout": "", "stderr": ""},
-                notes=["Select a valid file first."],
-            )
+        if st is None and file_path:
+            st = _stat_file(file_path)
+        if st is None:
+            return ZstegResult._error("scan", file_path, "No file selected or invalid path.", ["Select a valid file first."])
 
         # Detect runtime
         mode, base_cmd, detect_notes = _detect_runtime()
         notes.extend(detect_notes)
         if not base_cmd:
-            return ZstegResult(
-                tool="zsteg",
-                ok=False,
-                action="scan",
-                file=file_path,
-                cmd=[],
-                findings=[],
-                output_files=[],
-                errors="zsteg runtime not found (native or WSL).",
-                raw={"stdout": "", "stderr": ""},
-                notes=notes,
-            )
+            return ZstegResult._error("scan", file_path, "zsteg runtime not found (native or WSL).", notes)
 
-        file_arg = _maybe_wsl_path(mode, file_path)
+        abs_path = os.path.abspath(file_path)
+        file_arg = _maybe_wsl_path(mode, abs_path)
 
         # Build command with --no-file if needed on native Windows
         cmd = list(base_cmd)
-        if _is_windows() and mode == "native" and not _has_file_cmd():
+        if _IS_WINDOWS and mode == "native" and not _has_file_cmd():
             cmd += ["--no-file"]
         cmd += ["-a", file_arg]
 
-        try:
-            proc = _run(cmd, cwd=os.path.dirname(file_path), timeout=120, text=True)
-            stdout, stderr = proc.stdout, proc.stderr
-            ok = proc.returncode == 0
-
-            # Friendly errors / notes
-            if "command not found" in (stderr or "").lower():
-                notes.append("zsteg not installed. Install Ruby and `gem install zsteg`.")
-            if ("unknown file type" in (stdout + stderr).lower()) or ("not supported" in (stdout + stderr).lower()):
-                notes.append("Input may not be PNG/BMP; consider converting (e.g., `convert input.jpg output.png`).")
+        key = _cache_key(abs_path, st)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
 
-            findings = _parse_findings(stdout)
+        try:
+            returncode = None
+            if _use_worker():
+                try:
+                    returncode, stdout, stderr = _run_worker(mode, cmd[len(base_cmd):], _timeout(params, _SCAN_TIMEOUT))
+                    findings, dropped = None, 0
+                except RuntimeError as e:
+                    notes.append(f"Persistent zsteg worker unavailable, running zsteg directly: {e}")
+            if returncode is None:
+                returncode, stdout, stderr, findings, dropped = _run_streaming(cmd, timeout=_timeout(params, _SCAN_TIMEOUT))
+            if dropped:
+                notes.append(
+                    f"Raw output exceeded {_RAW_KEEP_CHARS // (1024 * 1024)} MB; the raw view shows its start and end only. "
+                    "Findings cover the whole output."
+                )
+            res = _scan_result(file_path, cmd, returncode, stdout, stderr, notes, findings=findings)
+            _cache_put(key, res)
+            return res
+
+        except subprocess.TimeoutExpired as e:
+            if not e.output:
+                return ZstegResult._error("scan", file_path, "Timeout while running zsteg scan.", notes, cmd)
+            # Partial scan: keep the findings printed before the kill, but don't cache them
+            notes.append(f"zsteg was stopped after {e.timeout}s; results below cover only the output produced until then.")
+            res = _scan_result(file_path, cmd, -1, e.output, e.stderr or "", notes)
+            res.errors = "Timeout while running zsteg scan."
+            return res
+        except Exception as e:
+            return ZstegResult._error("scan", file_path, f"Error running zsteg scan: {e}", notes, cmd)
 
-            return ZstegResult(
-                tool="zsteg",
-                ok=ok,
-                action="scan",
-                file=file_path,
-                cmd=cmd,
-                findings=findings,
-                output_files=[],
-                errors=None if ok else (_sanitize_stderr(stderr) or "Non-zero exit status"),
-                raw={"stdout": stdout, "stderr": _sanitize_stderr(stderr)},
-                notes=notes,
-            )
+    def run_batch(self, params: dict) -> List[ZstegResult]:
+        """
+        Scan every path in params["file_paths"] (falls back to params["file_path"]).
+        Native/unix runtimes scan the files concurrently on a thread pool.
+        In WSL mode the files share one `wsl -e bash -c` loop per chunk instead of one wsl.exe launch each,
+        unless ZSTEG_PERSISTENT is set, in which case every runtime goes through the persistent worker.
+        """
+        params = params or {}
+        file_paths = list(params.get("file_paths") or [])
+        if not file_paths and params.get("file_path"):
+            file_paths = [params["file_path"]]
+        if not file_paths:
+            return [self._run_scan(params)]
+
+        results: Dict[str, ZstegResult] = {}
+        valid: List[str] = []
+        stats: Dict[str, os.stat_result] = {}
+        for file_path in file_paths:
+            st = _stat_file(file_path)
+            if st is not None:
+                valid.append(file_path)
+                stats[file_path] = st
+            else:
+                results[file_path] = ZstegResult._error("scan", file_path, "No file selected or invalid path.", ["Select a valid file first."])
 
-        except subprocess.TimeoutExpired:
-            return ZstegResult(
-                tool="zsteg",
-                ok=False,
-                action="scan",
-                file=file_path,
-                cmd=cmd,
-                findings=[],
-                output_files=[],
-                errors="Timeout while running zsteg scan.",
-                raw={"stdout": "", "stderr": ""},
-                notes=notes,
-            )
-        except Exception as e:
-            return ZstegResult(
-                tool="zsteg",
-                ok=False,
-                action="scan",
-                file=file_path,
-                cmd=cmd,
-                findings=[],
-                output_files=[],
-                errors=f"Error running zsteg scan: {e}",
-                raw={"stdout": "", "stderr": ""},
-                notes=notes,
-            )
+        mode, base_cmd, detect_notes = _detect_runtime()
+        if valid and not base_cmd:
+            for file_path in valid:
+                results[file_path] = ZstegResult._error("scan", file_path, "zsteg runtime not found (native or WSL).", list(detect_notes))
+        elif valid and (mode != "wsl" or _use_worker()):
+            results.update(zip(valid, self._run_scan_many(valid, params, stats=stats)))
+        elif valid:
+            args = ["-a"]
+            file_args = [_maybe_wsl_path(mode, f) for f in valid]
+            procs, error = _run_batch_wsl(base_cmd, file_args, args, timeout=_timeout(params, _SCAN_TIMEOUT))
+
+            for file_path, file_arg, proc in zip(valid, file_args, procs):
+                if proc is None:
+                    results[file_path] = ZstegResult._error("scan", file_path, error, list(detect_notes), [*base_cmd, *args, file_arg])
+                else:
+                    results[file_path] = _scan_result(file_path, proc.args, proc.returncode, proc.stdout, proc.stderr, list(detect_notes))
+
+        return [results[f] for f in file_paths]
+
+    def _run_scan_many(
+        self,
+        paths: List[str],
+        params: Optional[dict] = None,
+        max_workers: Optional[int] = None,
+        stats: Optional[Dict[str, os.stat_result]] = None,
+    ) -> List[ZstegResult]:
+        """
+        Scan already-validated paths on a thread pool: zsteg is single-threaded per image, and the threads mostly wait on
+        the child process or in the regex engine with the GIL released. Each file gets its own timeout and error.
+        """
+        if not paths:
+            return []
+        timeout = (params or {}).get("timeout")
+        stats = stats or {}
+        workers = min(len(paths), max_workers or os.cpu_count() or 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda p: self._run_scan({"file_path": p, "timeout": timeout}, stats.get(p)), paths))
 
     def _run_extract(self, params: dict) -> ZstegResult:
         """
@@ -568,36 +1309,14 @@ class Feature(BaseFeature):
         file_path = (params or {}).get("file_path") or ""
         notes: List[str] = []
 
-        if not file_path or not os.path.isfile(file_path):
-            return ZstegResult(
-                tool="zsteg",
-                ok=False,
-                action="extract",
-                file=file_path,
-                cmd=[],
-                findings=[],
-                output_files=[],
-                errors="No file selected or invalid path.",
-                raw={"stdout": "", "stderr": ""},
-                notes=["Select a valid file first."],
-            )
+        if not file_path or _stat_file(file_path) is None:
+            return ZstegResult._error("extract", file_path, "No file selected or invalid path.", ["Select a valid file first."])
 
         # Detect runtime
         mode, base_cmd, detect_notes = _detect_runtime()
         notes.extend(detect_notes)
         if not base_cmd:
-            return ZstegResult(
-                tool="zsteg",
-                ok=False,
-                action="extract",
-                file=file_path,
-                cmd=[],
-                findings=[],
-                output_files=[],
-                errors="zsteg runtime not found (native or WSL).",
-                raw={"stdout": "", "stderr": ""},
-                notes=notes,
-            )
+            return ZstegResult._error("extract", file_path, "zsteg runtime not found (native or WSL).", notes)
 
         # Get channel from params or prompt
         channel = (params or {}).get("channel") or ""
@@ -607,41 +1326,39 @@ class Feature(BaseFeature):
 
         if not channel:
             notes.append("No channel specified; extraction skipped.")
-            return ZstegResult(
-                tool="zsteg",
-                ok=False,
-                action="extract",
-                file=file_path,
-                cmd=[],
-                findings=[],
-                output_files=[],
-                errors="Missing channel for extraction.",
-                raw={"stdout": "", "stderr": ""},
-                notes=notes,
-            )
+            return ZstegResult._error("extract", file_path, "Missing channel for extraction.", notes)
 
-        out_dir = os.path.dirname(os.path.abspath(file_path))
+        abs_path = os.path.abspath(file_path)
+        out_dir = os.path.dirname(abs_path)
         out_name = (params or {}).get("output_name") or "zsteg_extract.bin"
         out_path = os.path.join(out_dir, out_name)
 
-        file_arg = _maybe_wsl_path(mode, file_path)
+        file_arg = _maybe_wsl_path(mode, abs_path)
 
         # Build command with --no-file if needed
         cmd = list(base_cmd)
-        if _is_windows() and mode == "native" and not _has_file_cmd():
+        if _IS_WINDOWS and mode == "native" and not _has_file_cmd():
             cmd += ["--no-file"]
         cmd += ["-E", channel, file_arg]
 
+        # zsteg writes into a temp file next to the output; it only replaces out_path once the run succeeded,
+        # so a failed or timed-out extraction never truncates an earlier result.
+        part_path = f"{out_path}.{os.getpid()}.part"
         try:
-            proc = _run(cmd, cwd=os.path.dirname(file_path), timeout=120, text=False)
-            stdout_bytes = proc.stdout or b""
-            stderr_text = proc.stderr.decode("utf-8", errors="ignore") if proc.stderr else ""
-            ok = (proc.returncode == 0) and (len(stdout_bytes) > 0)
+            part = open(part_path, "wb")  # plain open() keeps the usual umask-based permissions
+        except OSError as werr:
+            return ZstegResult._error("extract", file_path, f"Cannot write the output file: {werr}", notes, cmd)
+
+        try:
+            with part:
+                returncode, stderr_bytes = _run_to_file(cmd, part, timeout=_timeout(params, _EXTRACT_TIMEOUT))
+                n_bytes = os.fstat(part.fileno()).st_size  # size via the open handle, no second path lookup
+            stderr_text = stderr_bytes.decode("utf-8", errors="ignore")
+            ok = (returncode == 0) and (n_bytes > 0)
 
             if ok:
                 try:
-                    with open(out_path, "wb") as f:
-                        f.write(stdout_bytes)
+                    os.replace(part_path, out_path)
                 except Exception as werr:
                     return ZstegResult(
                         tool="zsteg",
@@ -652,13 +1369,13 @@ class Feature(BaseFeature):
                         findings=[],
                         output_files=[],
                         errors=f"Extraction produced bytes but writing file failed: {werr}",
-                        raw={"stdout": f"<{len(stdout_bytes)} bytes>", "stderr": _sanitize_stderr(stderr_text)},
+                        raw={"stdout": f"<{n_bytes} bytes>", "stderr": _sanitize_stderr(stderr_text)},
                         notes=notes,
                     )
 
             if not ok:
                 # Make a friendly message and add suggestions
-                friendly_msg, extra_notes = _friendly_error(stderr_text, "", file_path, mode, base_cmd, attempted_channel=channel)
+                friendly_msg, extra_notes = _friendly_error(stderr_text, "", file_path, mode, base_cmd, attempted_channel=channel, detect_notes=detect_notes)
                 notes.extend(extra_notes)
 
             return ZstegResult(
@@ -670,33 +1387,17 @@ class Feature(BaseFeature):
                 findings=[],
                 output_files=[out_path] if ok else [],
                 errors=None if ok else friendly_msg,
-                raw={"stdout": f"<{len(stdout_bytes)} bytes>" if stdout_bytes else "", "stderr": _sanitize_stderr(stderr_text)},
+                raw={"stdout": f"<{n_bytes} bytes>" if n_bytes else "", "stderr": _sanitize_stderr(stderr_text)},
                 notes=notes,
             )
 
         except subprocess.TimeoutExpired:
-            return ZstegResult(
-                tool="zsteg",
-                ok=False,
-                action="extract",
-                file=file_path,
-                cmd=cmd,
-                findings=[],
-                output_files=[],
-                errors="Timeout while running zsteg extract.",
-                raw={"stdout": "", "stderr": ""},
-                notes=notes,
-            )
+            return ZstegResult._error("extract", file_path, "Timeout while running zsteg extract.", notes, cmd)
         except Exception as e:
-            return ZstegResult(
-                tool="zsteg",
-                ok=False,
-                action="extract",
-                file=file_path,
-                cmd=cmd,
-                findings=[],
-                output_files=[],
-                errors=f"Error running zsteg extract: {e}",
-                raw={"stdout": "", "stderr": ""},
-                notes=notes,
-            )
+            return ZstegResult._error("extract", file_path, f"Error running zsteg extract: {e}", notes, cmd)
+        finally:
+            # Already renamed away on success; otherwise drop the partial output
+            try:
+                os.remove(part_path)
+            except OSError:
+                pass
@@ -0,0 +1,55 @@
+# Long-lived zsteg worker used by zsteg.py when ZSTEG_PERSISTENT=1.
+# Loads Ruby and the zsteg gem once, then runs one zsteg command line per request,
+# so repeated scans skip the interpreter/gem start-up that dominates short runs.
+#
+# Request (stdin):  one JSON array of zsteg arguments per line, e.g. ["-a", "/path/image.png"]
+# Reply (stdout):   "<exit status> <stdout bytes> <stderr bytes>\n" followed by exactly that many bytes
+#                   of zsteg's stdout, then of its stderr.
+#
+# zsteg's own output is captured by pointing fd 1/2 at temp files for the duration of each run, so anything it
+# prints (via $stdout, STDOUT or C extensions) can never interleave with the reply framing.
+
+require 'json'
+require 'tempfile'
+require 'zsteg'
+begin
+  require 'zsteg/cli/cli'
+rescue LoadError
+  # Older gems load the CLI from zsteg.rb itself
+end
+
+reply = STDOUT.dup
+reply.binmode
+out = Tempfile.new('zsteg_out')
+err = Tempfile.new('zsteg_err')
+# Unlinked right away: the open handles keep working, and nothing is left behind if the worker gets killed
+[out, err].each(&:unlink)
+
+while (line = STDIN.gets)
+  argv = JSON.parse(line)
+  [out, err].each { |f| f.truncate(0); f.rewind }
+  STDOUT.reopen(out)
+  STDERR.reopen(err)
+  $stdout = STDOUT
+  $stderr = STDERR
+
+  status = 0
+  begin
+    ZSteg::CLI::Cli.new(argv).run
+  rescue SystemExit => e
+    status = e.status
+  rescue Exception => e
+    # Same shape as Ruby's report for an uncaught exception, so zsteg.py's error hints still match
+    trace = e.backtrace || []
+    STDERR.puts "#{trace.first}: #{e.message} (#{e.class})"
+    trace.drop(1).each { |frame| STDERR.puts "\tfrom #{frame}" }
+    status = 1
+  end
+  STDOUT.flush
+  STDERR.flush
+
+  o = out.tap(&:rewind).read.b
+  r = err.tap(&:rewind).read.b
+  reply.write("#{status} #{o.bytesize} #{r.bytesize}\n", o, r)
+  reply.flush
+end
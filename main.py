@@ -1,4 +1,6 @@
 import webview
+import atexit
+import signal
 import sys
 import os
 import traceback
@@ -7,22 +9,23 @@ import app_constants
 from app.core.API import API
 from app.core.feature_manager import FeatureManager
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WEB_DIR = os.path.join(BASE_DIR, "web")
+INDEX_HTML = os.path.join(WEB_DIR, app_constants.HTML_NAME)
+
+sys.path.append(os.path.dirname(BASE_DIR))
 app_api = None
 
 def start_app(debug=False):
     global app_api
 
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-
-    web_dir = os.path.join(base_dir, "web")
-    index_html = os.path.join(web_dir, app_constants.HTML_NAME)
-
     feature_manager = FeatureManager(app_constants.DEFAULTS, app_constants.APP_FEATURES, debug=debug)
     app_api = API(feature_manager, app_constants.SUPPORTED_FILE_TYPES, feature_reload_on_file_change=True)
+    # Runs once on any interpreter exit (window closed, error, sys.exit from a signal)
+    atexit.register(app_api.shutdown)
     main_window = webview.create_window(
         f"{app_constants.APP_NAME} {app_constants.APP_VERSION}",
-        str(index_html),
+        INDEX_HTML,
         js_api=app_api,
 
         width=app_constants.DEFAULT_WINDOW_DIMENSIONS[0],
@@ -34,16 +37,17 @@ def start_app(debug=False):
     )
     webview.start(gui='qt', debug=debug)
 
-def handle_exit():
-    if app_api:
-        app_api.shutdown()
+def handle_exit(signum, frame):
+    # Ctrl+C exits through sys.exit, so the atexit shutdown registered in start_app() still runs
     sys.exit(0)
 
 
 if __name__ == '__main__':
+    # Only SIGINT: Python handlers run when the main thread is back in bytecode, which webview.start() (Qt's C++ loop)
+    # can delay indefinitely. SIGTERM/SIGHUP keep their default disposition so `kill` and a closed terminal still stop the app.
+    signal.signal(signal.SIGINT, handle_exit)
+
     try:
         start_app(debug=True)
     except Exception as e:
-        traceback.print_exc()
-    finally:
-        handle_exit()
\ No newline at end of file
+        traceback.print_exc()
\ No newline at end of file